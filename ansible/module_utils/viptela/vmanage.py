@@ -1,5 +1,6 @@
 from ansible.module_utils.basic import AnsibleModule, json, env_fallback
 from vmanage.api.authentication import Authentication
+from vmanage.api.capabilities import CapabilitiesCache
 
 
 def vmanage_argument_spec():
@@ -8,7 +9,9 @@ def vmanage_argument_spec():
                 user=dict(type='str', required=True, fallback=(env_fallback, ['VMANAGE_USERNAME'])),
                 password=dict(type='str', required=True, fallback=(env_fallback, ['VMANAGE_PASSWORD'])),
                 validate_certs=dict(type='bool', required=False, default=False),
-                timeout=dict(type='int', default=30)
+                timeout=dict(type='int', default=30),
+                capabilities_cache=dict(type='bool', required=False, default=False,
+                                        fallback=(env_fallback, ['VMANAGE_CAPABILITIES_CACHE']))
                 )
 
 
@@ -24,13 +27,18 @@ class Vmanage(object):
         self.host = self.params['host']
         self.port = self.params['port']
         self.timeout = self.params['timeout']
+        # Only write the version cache to disk on the controller when asked to
+        self.capabilities_cache = CapabilitiesCache(persist=True) if self.params.get('capabilities_cache') else None
 
         self.__auth = None
 
     @property
     def auth(self):
         if self.__auth is None:
-            self.__auth = Authentication(host=self.host, user=self.username, password=self.password).login()
+            self.__auth = Authentication(host=self.host,
+                                         user=self.username,
+                                         password=self.password,
+                                         capabilities_cache=self.capabilities_cache).login()
         return self.__auth
 
     def exit_json(self, **kwargs):
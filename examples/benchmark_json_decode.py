@@ -0,0 +1,76 @@
+"""Compare JSON decoders on a vManage route table response.
+
+Usage:
+    python examples/benchmark_json_decode.py [recorded_response.json] [--routes N] [--repeat N]
+
+A recorded response body (e.g. saved from device/ip/routetable) is used
+when given, otherwise a synthetic route table of --routes entries is built.
+"""
+import argparse
+import json
+import timeit
+
+import requests
+from vmanage.api.json_decoder import DECODERS
+
+
+def synthetic_route_table(routes):
+    data = []
+    for i in range(routes):
+        data.append({
+            'vdevice-name': '1.1.3.1',
+            'vdevice-host-name': 'site1-vedge1',
+            'vdevice-dataKey': f'1.1.3.1-{i % 512}-10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}/32',
+            'vpn-id': str(i % 512),
+            'address-family': 'ipv4',
+            'prefix': f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}/32',
+            'protocol': 'omp',
+            'distance': '250',
+            'metric': '0',
+            'uptime': '1:02:03:04',
+            'nexthop-type': 'ipv4',
+            'ip': f'1.1.{(i >> 8) & 255}.{i & 255}',
+            'tloc-ip': f'1.1.{(i >> 8) & 255}.{i & 255}',
+            'tloc-color': 'mpls',
+            'tloc-encap': 'ipsec',
+            'rstatus': 'F,S',
+            'lastupdated': 1590000000000 + i,
+        })
+    return json.dumps({'header': {'generatedOn': 1590000000000}, 'data': data}).encode()
+
+
+def make_response(content):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json'
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('recorded', nargs='?', help='file containing a recorded vManage response body')
+    parser.add_argument('--routes', type=int, default=200000, help='routes in the synthetic route table')
+    parser.add_argument('--repeat', type=int, default=5, help='decodes per measurement')
+    args = parser.parse_args()
+
+    if args.recorded:
+        with open(args.recorded, 'rb') as f:
+            content = f.read()
+    else:
+        content = synthetic_route_table(args.routes)
+    print(f'Payload: {len(content) / 1e6:.1f} MB')
+
+    # The previous code path: build the full str, then the stdlib parser
+    baseline = min(timeit.repeat(lambda: json.loads(make_response(content).text), number=1, repeat=args.repeat))
+    print(f'{"json.loads(response.text)":32} {baseline:8.3f}s  1.00x')
+    for name, decoder in DECODERS.items():
+        elapsed = min(
+            timeit.repeat(lambda decoder=decoder: decoder.loads(make_response(content).content),
+                          number=1,
+                          repeat=args.repeat))
+        print(f'{name + ".loads(response.content)":32} {elapsed:8.3f}s  {baseline / elapsed:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+from vmanage.api.authentication import Authentication
+from vmanage.api.pagination import PageIterator
+import json
+import os
+
+vmanage_host = os.environ.get('VMANAGE_HOST')
+vmanage_username = os.environ.get('VMANAGE_USERNAME')
+vmanage_password = os.environ.get('VMANAGE_PASSWORD')
+checkpoint_file = 'interface_statistics.checkpoint'
+output_file = 'interface_statistics.jsonl'
+
+# Interface statistics for the last 24 hours
+query = {
+    'query': {
+        'condition': 'AND',
+        'rules': [{
+            'value': ['24'],
+            'field': 'entry_time',
+            'type': 'date',
+            'operator': 'last_n_hours'
+        }]
+    }
+}
+
+checkpoint = None
+if os.path.exists(checkpoint_file):
+    with open(checkpoint_file) as f:
+        checkpoint = json.load(f)
+
+output = open(output_file, 'a')
+
+
+def save_checkpoint(checkpoint):
+    # Records are flushed before the checkpoint moves past them
+    output.flush()
+    with open(checkpoint_file, 'w') as f:
+        json.dump(checkpoint, f)
+
+
+session = Authentication(host=vmanage_host, user=vmanage_username, password=vmanage_password).login()
+url = f'https://{vmanage_host}:443/dataservice/statistics/interface/page'
+# A scroll cannot be resumed exactly past prefetched pages
+statistics = PageIterator(session, url, query=query, prefetch=0, checkpoint=checkpoint, on_checkpoint=save_checkpoint)
+for record in statistics:
+    output.write(json.dumps(record) + '\n')
+output.close()
+print(f'{statistics.checkpoint["offset"]} records written to {output_file}')
@@ -0,0 +1,30 @@
+from vmanage.api.authentication import Authentication
+from vmanage.aio.transport import ThreadOffloadTransport
+from vmanage.aio.device import Device
+from vmanage.aio.monitor_network import MonitorNetwork
+import asyncio
+import pprint
+import os
+
+vmanage_host = os.environ.get('VMANAGE_HOST')
+vmanage_username = os.environ.get('VMANAGE_USERNAME')
+vmanage_password = os.environ.get('VMANAGE_PASSWORD')
+pp = pprint.PrettyPrinter(indent=2)
+
+
+async def main():
+    auth = Authentication(host=vmanage_host, user=vmanage_username,
+                          password=vmanage_password, pool_maxsize=100).login()
+    async with ThreadOffloadTransport(auth, max_concurrency=100) as transport:
+        vmanage_device = Device(transport, vmanage_host)
+        vmanage_monitor = MonitorNetwork(transport, vmanage_host)
+
+        device_list = await vmanage_device.get_device_config_list('vedges')
+        system_ips = [device['deviceIP'] for device in device_list if 'deviceIP' in device]
+        results = await asyncio.gather(*[vmanage_monitor.get_control_connections(ip) for ip in system_ips],
+                                       return_exceptions=True)
+        for system_ip, control_connections in zip(system_ips, results):
+            pp.pprint({system_ip: control_connections})
+
+
+asyncio.run(main())
@@ -0,0 +1,22 @@
+from vmanage.api.cluster import ClusterAuthentication, LEAST_OUTSTANDING
+from vmanage.api.device import Device
+from vmanage.api.monitor_network import MonitorNetwork
+import pprint
+import os
+
+# Comma separated cluster nodes, the primary node first
+vmanage_hosts = os.environ.get('VMANAGE_HOSTS').split(',')
+vmanage_username = os.environ.get('VMANAGE_USERNAME')
+vmanage_password = os.environ.get('VMANAGE_PASSWORD')
+pp = pprint.PrettyPrinter(indent=2)
+
+cluster = ClusterAuthentication(hosts=vmanage_hosts, user=vmanage_username, password=vmanage_password,
+                                strategy=LEAST_OUTSTANDING, pool_maxsize=50).login()
+vmanage_device = Device(cluster, vmanage_hosts[0])
+vmanage_monitor = MonitorNetwork(cluster, vmanage_hosts[0])
+
+device_list = vmanage_device.get_device_config_list('vedges')
+system_ips = [device['deviceIP'] for device in device_list if 'deviceIP' in device]
+for result in vmanage_monitor.map('get_control_connections', system_ips, max_workers=50):
+    pp.pprint({result.system_ip: result.error or result.result})
+pp.pprint(cluster.node_stats())
@@ -17,6 +17,9 @@ setup(
     packages=find_namespace_packages(include=includes),
     description="Cisco DevNet SD-WAN vManage (Viptela) CLI/SDK",
     install_requires=['Click', 'requests', 'dictdiffer', 'PyYAML'],
+    extras_require={
+        'fast-json': ['orjson'],
+    },
     entry_points='''
         [console_scripts]
         vmanage=vmanage.__main__:vmanage
@@ -0,0 +1,50 @@
+"""Tests for vmanage.api.cluster.
+"""
+
+import requests
+from vmanage.api.circuit_breaker import CLOSED, CircuitBreaker
+from vmanage.api.cluster import LEAST_OUTSTANDING, ClusterNode, ClusterTransport
+from vmanage.api.http_methods import HttpMethods
+
+PRIMARY_URL = 'https://primary:443/dataservice/device/monitor'
+
+
+class NodeSession(object):
+    def __init__(self, status_code, circuit_breaker):
+        self.status_code = status_code
+        self.circuit_breaker = circuit_breaker
+        self.auth_generation = 0
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        response = requests.models.Response()
+        response.status_code = self.status_code
+        response.url = url
+        response.headers['Content-Type'] = 'application/json'
+        response._content = b'{"data": []}'  # pylint: disable=protected-access
+        return response
+
+    def reauthenticate(self, generation):
+        return False
+
+
+def test_failing_node_leaves_the_primary_circuit_closed():
+    breaker = CircuitBreaker(failure_threshold=1)
+    primary = NodeSession(200, breaker)
+    sick = NodeSession(503, breaker)
+    cluster = ClusterTransport([ClusterNode('primary', 443, primary), ClusterNode('sick', 443, sick)],
+                               strategy=LEAST_OUTSTANDING)
+    cluster.primary.requests = 1
+
+    try:
+        HttpMethods(cluster, PRIMARY_URL).request('GET')
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+    assert sick.calls == [('GET', 'https://sick:443/dataservice/device/monitor')]
+    assert breaker.state(PRIMARY_URL) == CLOSED
+    assert cluster.node_stats()['sick:443']['down']
+
+    HttpMethods(cluster, 'https://primary:443/dataservice/template/device').request('POST', payload='{}')
+    assert primary.calls[-1][0] == 'POST'
@@ -0,0 +1,56 @@
+"""Tests for vmanage.api.compression.
+"""
+
+import gzip
+import io
+import zlib
+
+import pytest
+import requests
+import urllib3
+from vmanage.api.compression import iter_body
+
+BODY = b'{"data": [' + b', '.join(b'{"id": %d}' % i for i in range(2000)) + b']}'
+
+
+def raw_deflate(data):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def make_response(body, encoding):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers['Content-Encoding'] = encoding
+    response.raw = urllib3.response.HTTPResponse(body=io.BytesIO(body),
+                                                 headers={'Content-Encoding': encoding},
+                                                 preload_content=False)
+    return response
+
+
+def read_body(response, chunk_size=1024):
+    chunks = list(iter_body(response, chunk_size))
+    return sum(wire for wire, _ in chunks), b''.join(chunk for _, chunk in chunks)
+
+
+@pytest.mark.parametrize('encoding, encode', [
+    ('gzip', gzip.compress),
+    ('deflate', zlib.compress),
+    ('deflate', raw_deflate),
+])
+def test_iter_body_decodes(encoding, encode):
+    wire = encode(BODY)
+    wire_bytes, content = read_body(make_response(wire, encoding))
+    assert content == BODY
+    assert wire_bytes == len(wire)
+
+
+def test_iter_body_raw_deflate_small_chunks():
+    wire = raw_deflate(BODY)
+    _, content = read_body(make_response(wire, 'deflate'), chunk_size=7)
+    assert content == BODY
+
+
+def test_iter_body_invalid_body():
+    with pytest.raises(ValueError):
+        read_body(make_response(b'not compressed at all', 'gzip'))
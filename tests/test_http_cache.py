@@ -0,0 +1,48 @@
+"""Tests for vmanage.api.http_cache.
+"""
+
+import json
+
+import requests
+from vmanage.api.http_cache import HttpCache
+from vmanage.api.http_methods import HttpMethods
+
+BASE_URL = 'https://vmanage:443/dataservice/'
+
+
+class CachingSession(object):
+    def __init__(self):
+        self.http_cache = HttpCache()
+        self.masters = 0
+        self.gets = 0
+
+    def request(self, method, url, **kwargs):
+        if method == 'GET':
+            self.gets += 1
+            body = {'data': [{'templateId': 'a', 'attachedMastersCount': self.masters}]}
+        else:
+            self.masters += 1
+            body = {'id': 'action'}
+        response = requests.models.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps(body).encode()  # pylint: disable=protected-access
+        return response
+
+
+def test_write_invalidates_other_prefixes():
+    session = CachingSession()
+    templates_url = BASE_URL + 'template/feature'
+
+    before = HttpMethods(session, templates_url).request('GET')['json']['data'][0]
+    HttpMethods(session, templates_url).request('GET')
+    assert session.gets == 1
+
+    # Attaching a device template changes the feature templates it uses
+    HttpMethods(session, BASE_URL + 'template/device/config/attachfeature').request('POST', payload='{}')
+    after = HttpMethods(session, templates_url).request('GET')['json']['data'][0]
+
+    assert session.gets == 2
+    assert before['attachedMastersCount'] == 0
+    assert after['attachedMastersCount'] == 1
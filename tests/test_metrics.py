@@ -0,0 +1,28 @@
+"""Tests for vmanage.api.metrics.
+"""
+
+import re
+
+from vmanage.api.metrics import MetricsCollector
+
+# name{label="value",...} number, with values escaped as the text format requires
+SAMPLE = re.compile(r'^[a-z_]+\{([a-z]+="(?:[^"\\\n]|\\[\\"n])*",?)+\} \S+$')
+
+
+def test_prometheus_escapes_hostile_label_values():
+    collector = MetricsCollector()
+    collector.after_request({
+        'endpoint': 'device/"quoted"\\path\nnext',
+        'method': 'get',
+        'url': 'https://vmanage:443/dataservice/device',
+        'elapsed': 0.1,
+        'status_code': 200,
+        'circuit': 'closed',
+    })
+
+    lines = collector.to_prometheus().splitlines()
+
+    for line in lines:
+        assert line.startswith('#') or SAMPLE.match(line), line
+    assert ('vmanage_http_responses_total{endpoint="device/\\"quoted\\"\\\\path\\nnext",method="GET",status="200"} 1'
+            in lines)
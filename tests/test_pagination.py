@@ -0,0 +1,57 @@
+"""Tests for vmanage.api.pagination.
+"""
+
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from vmanage.api.pagination import OFFSET, SCROLL, PageIterator
+
+URL = 'https://vmanage:443/dataservice/statistics/interface/page'
+
+
+class ScrollServer(object):
+    """A vManage scroll: every fetch moves the cursor, consumed or not."""
+    def __init__(self, records, page_size):
+        self.records = records
+        self.page_size = page_size
+        self.cursor = 0
+
+    def http_methods(self, session, url):
+        server = self
+
+        class FakeHttpMethods(object):
+            def request(self, method, payload=None):
+                if 'scrollId' not in parse_qs(urlsplit(url).query):
+                    server.cursor = 0
+                page = server.records[server.cursor:server.cursor + server.page_size]
+                server.cursor += len(page)
+                page_info = {'scrollId': 'scroll', 'hasMoreData': server.cursor < len(server.records)}
+                return {'json': {'data': page, 'pageInfo': page_info}}
+
+        return FakeHttpMethods()
+
+
+def test_resumed_scroll_loses_no_records():
+    server = ScrollServer(list(range(10)), page_size=2)
+    checkpoints = []
+    with mock.patch('vmanage.api.pagination.HttpMethods', side_effect=server.http_methods):
+        first = PageIterator(None, URL, query={}, page_size=2, on_checkpoint=checkpoints.append)
+        pages = first.pages()
+        exported = next(pages) + next(pages)
+        pages.close()
+
+        resumed = PageIterator(None, URL, query={}, page_size=2, checkpoint=checkpoints[-1])
+        exported += list(resumed)
+
+    assert exported == list(range(10))
+
+
+def test_checkpointed_scroll_rejects_prefetch():
+    with pytest.raises(Exception):
+        PageIterator(None, URL, mode=SCROLL, prefetch=1, on_checkpoint=print)
+
+
+def test_checkpointed_offset_query_prefetches():
+    iterator = PageIterator(None, URL, mode=OFFSET, checkpoint={'scroll_id': None, 'offset': 4, 'done': False})
+    assert iterator.prefetch == 1
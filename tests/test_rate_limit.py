@@ -0,0 +1,44 @@
+"""Tests for vmanage.api.rate_limit.
+"""
+
+import time
+
+import pytest
+from vmanage.api.rate_limit import RateLimiter, TokenBucket
+
+
+def test_fractional_rate_allows_a_request():
+    bucket = TokenBucket(0.5)
+    assert bucket.capacity == 1
+    assert bucket.acquire() == 0
+
+
+def test_acquire_waits_for_the_next_token():
+    bucket = TokenBucket(20, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    waited = bucket.acquire()
+    assert waited > 0
+    assert time.monotonic() - start >= 0.04
+
+
+@pytest.mark.parametrize('rate', [0, -1, -0.5])
+def test_invalid_rate(rate):
+    with pytest.raises(ValueError):
+        TokenBucket(rate)
+
+
+def test_invalid_rate_in_rate_limiter():
+    with pytest.raises(ValueError):
+        RateLimiter({'device/': 0})
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        TokenBucket(1, capacity=0)
+
+
+def test_acquire_more_than_capacity():
+    bucket = TokenBucket(0.5)
+    with pytest.raises(ValueError):
+        bucket.acquire(2)
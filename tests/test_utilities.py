@@ -0,0 +1,47 @@
+"""Tests for vmanage.api.utilities.
+"""
+
+import time
+from unittest import mock
+
+from vmanage.api.polling import PollingPolicy
+from vmanage.api.utilities import Utilities
+
+
+def action_status(status):
+    return {'status': status, 'action_status': status}
+
+
+def test_wait_for_actions_yields_finished_action_before_slow_poll():
+    def get_action_status(action_id):
+        if action_id == 'slow':
+            time.sleep(1)
+        return action_status('done')
+
+    utilities = Utilities(None, 'vmanage', polling_policy=PollingPolicy(initial_delay=0.01, jitter=0))
+    with mock.patch.object(utilities, 'get_action_status', side_effect=get_action_status):
+        start = time.monotonic()
+        actions = utilities.wait_for_actions(['slow', 'fast'])
+        first = next(actions)
+        first_elapsed = time.monotonic() - start
+        second = next(actions)
+
+    assert first['action_status'] == 'done'
+    assert utilities.action_stats['fast']['polls'] == 1
+    assert first_elapsed < 0.5
+    assert second['action_stats']['elapsed'] >= 1
+
+
+def test_wait_for_actions_polls_until_done():
+    statuses = {'a': ['in_progress', 'in_progress', 'done'], 'b': ['done']}
+
+    def get_action_status(action_id):
+        return action_status(statuses[action_id].pop(0))
+
+    utilities = Utilities(None, 'vmanage', polling_policy=PollingPolicy(initial_delay=0.01, jitter=0))
+    with mock.patch.object(utilities, 'get_action_status', side_effect=get_action_status):
+        results = list(utilities.wait_for_actions(['a', 'b']))
+
+    assert len(results) == 2
+    assert utilities.action_stats['a']['polls'] == 3
+    assert utilities.action_stats['b']['polls'] == 1
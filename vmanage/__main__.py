@@ -8,6 +8,9 @@ from vmanage.cli.clean import clean
 from vmanage.cli.certificate import certificate
 from vmanage.cli.set_cmd import set_cmd
 from vmanage.api.authentication import Authentication
+from vmanage.api.capabilities import CapabilitiesCache
+from vmanage.api.session_cache import SessionCache
+from vmanage.api.single_flight import SingleFlight
 
 # from vmanage.api.big import vmanage_session
 
@@ -23,17 +26,25 @@ class CatchAllExceptions(click.Group):
 
 
 class Viptela(object):
-    def __init__(self, host, username, password):
+    def __init__(self, host, username, password, session_cache=False, capabilities_cache=False, single_flight=False):
         self.host = host
         self.username = username
         self.password = password
+        self.session_cache = SessionCache() if session_cache else None
+        self.capabilities_cache = CapabilitiesCache(persist=True) if capabilities_cache else None
+        self.single_flight = SingleFlight() if single_flight else None
         self.__auth = None
 
     # use this to defer authentication until it's needed
     @property
     def auth(self):
         if self.__auth is None:
-            self.__auth = Authentication(host=self.host, user=self.username, password=self.password).login()
+            self.__auth = Authentication(host=self.host,
+                                         user=self.username,
+                                         password=self.password,
+                                         session_cache=self.session_cache,
+                                         capabilities_cache=self.capabilities_cache,
+                                         single_flight=self.single_flight).login()
         return self.__auth
 
 
@@ -47,9 +58,26 @@ class Viptela(object):
               hide_input=True,
               help='vManage Password (env: VMANAGE_PASSWORD)',
               required=True)
+@click.option('--session-cache/--no-session-cache',
+              envvar='VMANAGE_SESSION_CACHE',
+              default=False,
+              help='Reuse the vManage session between invocations (env: VMANAGE_SESSION_CACHE)')
+@click.option('--capabilities-cache/--no-capabilities-cache',
+              envvar='VMANAGE_CAPABILITIES_CACHE',
+              default=False,
+              help='Keep the vManage version on disk between invocations (env: VMANAGE_CAPABILITIES_CACHE)')
+@click.option('--single-flight/--no-single-flight',
+              envvar='VMANAGE_SINGLE_FLIGHT',
+              default=False,
+              help='Share the response of identical concurrent GETs (env: VMANAGE_SINGLE_FLIGHT)')
 @click.pass_context
-def vmanage(ctx, host, username, password):
-    ctx.obj = Viptela(host, username, password)
+def vmanage(ctx, host, username, password, session_cache, capabilities_cache, single_flight):
+    ctx.obj = Viptela(host,
+                      username,
+                      password,
+                      session_cache=session_cache,
+                      capabilities_cache=capabilities_cache,
+                      single_flight=single_flight)
 
 
 vmanage.add_command(activate)
@@ -0,0 +1,144 @@
+"""Generated Asyncio Wrappers for the Cisco vManage API Classes.
+"""
+
+import asyncio
+import functools
+import inspect
+
+from vmanage.utils import DeviceResult
+
+_DONE = object()
+
+
+class AsyncIterator(object):
+    """Asynchronous Iterator over a Blocking Generator
+
+    Returned in place of the generators of vmanage.api (stream=True
+    listings, wait_for_actions, ...).  Each item is produced on the
+    ThreadOffloadTransport thread pool.
+
+    """
+    def __init__(self, transport, iterator):
+        self.transport = transport
+        self.iterator = iterator
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.transport.run(next, self.iterator, _DONE)
+        if item is _DONE:
+            raise StopAsyncIteration
+        return item
+
+
+class AsyncApi(object):
+    """Base Class of the Asyncio vManage API Classes
+
+    Holds the synchronous API object (api) the coroutines run on, an
+    instance of the sync_class that async_api sets on each subclass.
+    Attributes that are not coroutines, such as caches and settings,
+    are those of the synchronous object.
+
+    """
+    def __init__(self, transport, host, port=443, **kwargs):
+        """Initialize the API object with session parameters.
+
+        Args:
+            transport (obj): ThreadOffloadTransport object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            kwargs: Passed through to the synchronous API class
+
+        """
+
+        sync_class = getattr(type(self), 'sync_class', None)
+        if sync_class is None:
+            raise TypeError(f'{type(self).__name__} must be decorated with async_api')
+        self.transport = transport
+        self.host = host
+        self.port = port
+        self.api = sync_class(transport.session, host, port, **kwargs)
+
+    def __getattr__(self, name):
+        api = self.__dict__.get('api')
+        if api is None:
+            raise AttributeError(name)
+        return getattr(api, name)
+
+
+def _async_method(name, func):
+    @functools.wraps(func)
+    async def method(self, *args, **kwargs):
+        result = await self.transport.run(getattr(self.api, name), *args, **kwargs)
+        if inspect.isgenerator(result):
+            return AsyncIterator(self.transport, result)
+        return result
+
+    return method
+
+
+def async_api(sync_class, sync_methods=None):
+    """Class decorator generating the coroutines of an asyncio API class.
+
+    Every public method of sync_class that the decorated class does not
+    define itself becomes a coroutine that runs the synchronous method
+    on the ThreadOffloadTransport, with the same signature and
+    docstring.  A method returning a generator returns an AsyncIterator
+    instead.  Generating the methods keeps the asyncio API in step with
+    vmanage.api.
+
+    Args:
+        sync_class (class): The vmanage.api class
+        sync_methods (list): Methods that do no I/O and are left
+            synchronous, default None
+
+    Returns:
+        result (callable): The class decorator.
+    """
+
+    sync_methods = set(sync_methods or [])
+
+    def decorate(cls):
+        cls.sync_class = sync_class
+        for name, func in inspect.getmembers(sync_class, inspect.isfunction):
+            if name.startswith('_') or name in sync_methods or any(name in vars(base) for base in cls.__mro__[:-1]):
+                continue
+            setattr(cls, name, _async_method(name, func))
+        return cls
+
+    return decorate
+
+
+async def map_devices(func, system_ips, *args):
+    """Await a per-device coroutine method for many devices.
+
+    The calls are bounded by the ThreadOffloadTransport concurrency limit.
+    Results are yielded as each device completes, not in input order.
+    An exception raised for one device is returned in that device's
+    result instead of aborting the remaining devices.
+
+    Args:
+        func (callable): The per-device coroutine method, called as
+            func(*args, system_ip)
+        system_ips (list): The system IPs of the devices
+        args: Leading positional arguments for func
+
+    Returns:
+        result (async generator): DeviceResult(system_ip, result, error)
+            tuples.
+    """
+
+    async def call(system_ip):
+        try:
+            return DeviceResult(system_ip, await func(*args, system_ip), None)
+        except Exception as e:  # pylint: disable=broad-except
+            return DeviceResult(system_ip, None, e)
+
+    tasks = [asyncio.ensure_future(call(system_ip)) for system_ip in system_ips]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,35 @@
+"""Asyncio Cisco vManage Device Inventory API Methods.
+"""
+
+from vmanage.aio.api import AsyncApi, async_api, map_devices
+from vmanage.api.device import Device as SyncDevice
+
+
+@async_api(SyncDevice)
+class Device(AsyncApi):
+    """Asyncio vManage Device Inventory API
+
+    Awaitable equivalent of vmanage.api.device.Device, generated from
+    it (see async_api).
+
+    """
+    def map(self, method, system_ips, *args):
+        """Await a per-device method for many devices concurrently.
+
+        The system IP is passed as the last argument, as in
+        vmanage.api.device.Device.map.
+
+        Args:
+            method (str or callable): Method name or bound coroutine
+                method
+            system_ips (list): Device System IPs
+            args: Leading positional arguments for method
+
+        Returns:
+            result (async generator): DeviceResult(system_ip, result,
+                error) tuples in order of completion.
+        """
+
+        if isinstance(method, str):
+            method = getattr(self, method)
+        return map_devices(method, system_ips, *args)
@@ -0,0 +1,15 @@
+"""Asyncio Cisco vManage Device Templates API Methods.
+"""
+
+from vmanage.aio.api import AsyncApi, async_api
+from vmanage.api.device_templates import DeviceTemplates as SyncDeviceTemplates
+
+
+@async_api(SyncDeviceTemplates)
+class DeviceTemplates(AsyncApi):
+    """Asyncio vManage Device Templates API
+
+    Awaitable equivalent of vmanage.api.device_templates.DeviceTemplates,
+    generated from it (see async_api).
+
+    """
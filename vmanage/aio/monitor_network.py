@@ -0,0 +1,32 @@
+"""Asyncio Cisco vManage Monitor Networks API Methods.
+"""
+
+from vmanage.aio.api import AsyncApi, async_api, map_devices
+from vmanage.api.monitor_network import MonitorNetwork as SyncMonitorNetwork
+
+
+@async_api(SyncMonitorNetwork)
+class MonitorNetwork(AsyncApi):
+    """Asyncio vManage Monitor Networks API
+
+    Awaitable equivalent of vmanage.api.monitor_network.MonitorNetwork,
+    generated from it (see async_api).
+
+    """
+    def map(self, method, system_ips):
+        """Await a per-device monitoring method for many devices
+        concurrently.
+
+        Args:
+            method (str or callable): Method name (e.g. 'get_omp_peers')
+                or bound coroutine method taking a system IP
+            system_ips (list): Device System IPs
+
+        Returns:
+            result (async generator): DeviceResult(system_ip, result,
+                error) tuples in order of completion.
+        """
+
+        if isinstance(method, str):
+            method = getattr(self, method)
+        return map_devices(method, system_ips)
@@ -0,0 +1,16 @@
+"""Asyncio Cisco vManage Policy Lists API Methods.
+"""
+
+from vmanage.aio.api import AsyncApi, async_api
+from vmanage.api.policy_lists import PolicyLists as SyncPolicyLists
+
+
+@async_api(SyncPolicyLists, sync_methods=['clear_policy_list_cache'])
+class PolicyLists(AsyncApi):
+    """Asyncio vManage Policy Lists API
+
+    Awaitable equivalent of vmanage.api.policy_lists.PolicyLists,
+    generated from it (see async_api).  The policy list cache and index
+    are shared with the wrapped synchronous object.
+
+    """
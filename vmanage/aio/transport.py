@@ -0,0 +1,89 @@
+"""Thread Offloading Transport for Awaiting Cisco vManage API Methods.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+class ThreadOffloadTransport(object):
+    """Thread Offloading Wrapper for vManage API Interaction
+
+    Wraps an authenticated session (normally the Transport returned by
+    Authentication.login()) so that the vmanage.api methods can be
+    awaited from asyncio code.  It is not an asyncio-native HTTP
+    client: each call runs the synchronous API method, and so a
+    blocking Requests call, on a thread pool while a semaphore bounds
+    the number of calls in flight.  The URL builders, error handling
+    and ParseMethods semantics are exactly those of vmanage.api.
+
+    Every request in flight occupies one pool thread until its response
+    arrives, so keeping hundreds of requests in flight costs hundreds
+    of OS threads, bounded by max_concurrency, and gives no more
+    concurrency than a ThreadPoolExecutor would.  What it does give
+    asyncio code is that the event loop stays free while they run, and
+    waits between polls (Utilities) sleep on the loop without holding
+    a thread.
+
+    The session connection pool should be at least max_concurrency
+    connections (Authentication pool_maxsize) or requests will queue
+    for a free connection.
+
+    """
+    def __init__(self, session, max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None):
+        """Initialize ThreadOffloadTransport object with concurrency parameters.
+
+        Args:
+            session (obj): Requests Session or Transport object
+            max_concurrency (int): maximum number of requests in
+                flight at once, default 100
+            executor (obj): concurrent.futures Executor to run requests
+                on, default a ThreadPoolExecutor of max_concurrency
+
+        """
+
+        self.session = session
+        self.max_concurrency = max_concurrency
+        self._own_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='vmanage-aio')
+        self.executor = executor
+        self._semaphore = None
+
+    @property
+    def semaphore(self):
+        # Created lazily so that it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking vmanage.api method within the concurrency limit.
+
+        Args:
+            func (callable): The method to run
+            args: Positional arguments for func
+            kwargs: Keyword arguments for func
+
+        Returns:
+            result: The return value of func.
+        """
+
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def close(self):
+        """Shut down the thread pool if it is owned by this transport.
+
+        """
+        if self._own_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
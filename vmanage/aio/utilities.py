@@ -0,0 +1,116 @@
+"""Asyncio Cisco vManage Utilities API Methods.
+"""
+
+import asyncio
+
+from vmanage.aio.api import AsyncApi, async_api
+from vmanage.api.utilities import Utilities as SyncUtilities
+
+
+@async_api(SyncUtilities)
+class Utilities(AsyncApi):
+    """Asyncio Access to Various vManage Utilities.
+
+    Awaitable equivalent of vmanage.api.utilities.Utilities, generated
+    from it (see async_api).  Waiting for actions and tasks follows the
+    same PollSchedule as the synchronous methods but sleeps on the
+    event loop rather than holding a worker thread between polls.
+
+    """
+    def __init__(self, transport, host, port=443, polling_policy=None):
+        """Initialize Utilities object with session parameters.
+
+        Args:
+            transport (obj): ThreadOffloadTransport object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            polling_policy (obj): PollingPolicy used when waiting on
+                actions, default DEFAULT_POLLING_POLICY
+
+        """
+
+        super().__init__(transport, host, port, polling_policy=polling_policy)
+
+    async def waitfor_action_completion(self, action_id, polling_policy=None):
+        """Wait for an action to complete.
+
+        Args:
+            action_id (str): The ID of the action
+            polling_policy (obj): PollingPolicy overriding the default
+                for this call
+
+        Returns:
+            result (dict): The final action status along with timing
+                stats ('action_stats') for the wait.
+
+        Raises:
+            Exception: The polling policy timeout expired.
+        """
+
+        schedule = (polling_policy or self.polling_policy).schedule(f'action {action_id}')
+        for delay in schedule:
+            await asyncio.sleep(delay)
+            result = await self.get_action_status(action_id)
+            if result.pop('status') != 'in_progress':
+                break
+
+        result['action_stats'] = schedule.stats()
+        self.action_stats[action_id] = result['action_stats']
+        return result
+
+    async def wait_for_actions(self, action_ids, polling_policy=None):
+        """Wait for several actions to complete at once.
+
+        Args:
+            action_ids (list): The IDs of the actions
+            polling_policy (obj): PollingPolicy overriding the default
+                for this call
+
+        Returns:
+            result (async generator): The final status of each action,
+                in order of completion.
+
+        Raises:
+            Exception: The polling policy timeout expired.
+        """
+
+        tasks = [
+            asyncio.ensure_future(self.waitfor_action_completion(action_id, polling_policy=polling_policy))
+            for action_id in dict.fromkeys(action_ids)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def wait_for_tasks(self, task_ids=None, polling_policy=None):
+        """Wait for vManage tasks to finish.
+
+        Args:
+            task_ids (list): The IDs of the tasks to wait for, default
+                None (wait for all tasks)
+            polling_policy (obj): PollingPolicy overriding the default
+                for this call
+
+        Returns:
+            result (dict or list): Timing stats for the wait, or the
+                final status of each task when task_ids is given.
+
+        Raises:
+            Exception: The polling policy timeout expired.
+        """
+
+        if task_ids:
+            return [result async for result in self.wait_for_actions(task_ids, polling_policy=polling_policy)]
+
+        schedule = (polling_policy or self.polling_policy).schedule('active tasks')
+        for delay in schedule:
+            await asyncio.sleep(delay)
+            data = await self.get_active_count()
+            if data['activeTaskCount'] == 0:
+                break
+            schedule.description = f"{data['activeTaskCount']} active tasks"
+
+        return schedule.stats()
@@ -5,6 +5,9 @@ from __future__ import (absolute_import, division, print_function)
 
 import requests
 import urllib3
+from vmanage.api.capabilities import DEFAULT_CAPABILITIES_CACHE
+from vmanage.api.compression import DEFAULT_COMPRESS_MIN_SIZE
+from vmanage.api.transport import Transport, check_ssl_context, DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
 from vmanage.api.utilities import Utilities
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -15,11 +18,32 @@ class Authentication(object):
 
     Responsible for retrieving the JSESSIONID after a username/password
     has been authenticated.  If the vManage version is >= 19.2.0 then
-    the X-XSRF-TOKEN will be retrieved and added to the header.  An
-    HTTP(S) Request session object will be returned.
+    the X-XSRF-TOKEN will be retrieved and added to the header.  A
+    pooled Transport (a Requests session) will be returned.
 
     """
-    def __init__(self, host=None, user=None, password=None, port=443, validate_certs=False, timeout=10):
+    def __init__(self,
+                 host=None,
+                 user=None,
+                 password=None,
+                 port=443,
+                 validate_certs=False,
+                 timeout=10,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False,
+                 ssl_context=None,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 request_hooks=None,
+                 json_decoder=None,
+                 compress_requests=False,
+                 compress_min_size=DEFAULT_COMPRESS_MIN_SIZE,
+                 http_cache=None,
+                 single_flight=None,
+                 circuit_breaker=None,
+                 session_cache=None,
+                 capabilities_cache=None):
         """Initialize Authentication object with session parameters.
 
         Args:
@@ -31,6 +55,36 @@ class Authentication(object):
                 on or off.
             timeout (int): how long Reqeusts will wait for a
                 response from the server, default 10 seconds
+            pool_connections (int): number of per-host connection
+                pools kept by the transport, default 10
+            pool_maxsize (int): maximum number of connections kept
+                open to vManage, default 20
+            pool_block (bool): block instead of exceeding pool_maxsize
+            ssl_context (obj): ssl.SSLContext shared by all pooled
+                connections, default None.  It must validate
+                certificates if and only if validate_certs is on.
+            retry_policy (obj): RetryPolicy for API requests made with
+                the returned transport, default None (no retries)
+            rate_limiter (obj): RateLimiter for API requests made with
+                the returned transport, default None (unlimited)
+            request_hooks (list): RequestHook objects (such as a
+                MetricsCollector) told about every API request
+            json_decoder (obj): JsonDecoder for API responses, default
+                the fastest installed
+            compress_requests (bool): gzip large POST/PUT bodies,
+                default False
+            compress_min_size (int): smallest body compressed, default
+                4096 bytes
+            http_cache (obj): HttpCache revalidating template and policy
+                GETs with ETag / Last-Modified, default None
+            single_flight (obj): SingleFlight sharing concurrent
+                identical GETs, default None
+            circuit_breaker (obj): CircuitBreaker failing calls to an
+                unhealthy vManage fast, default None
+            session_cache (obj): SessionCache used to reuse a previous
+                session instead of logging in, default None
+            capabilities_cache (obj): CapabilitiesCache holding the
+                vManage version, default DEFAULT_CAPABILITIES_CACHE
 
         """
 
@@ -40,8 +94,26 @@ class Authentication(object):
         self.port = port
         self.timeout = timeout
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
-        self.session = requests.Session()
+        check_ssl_context(ssl_context, validate_certs)
+        self.session = Transport(pool_connections=pool_connections,
+                                 pool_maxsize=pool_maxsize,
+                                 pool_block=pool_block,
+                                 ssl_context=ssl_context,
+                                 retry_policy=retry_policy,
+                                 rate_limiter=rate_limiter,
+                                 request_hooks=request_hooks,
+                                 json_decoder=json_decoder,
+                                 compress_requests=compress_requests,
+                                 compress_min_size=compress_min_size,
+                                 http_cache=http_cache,
+                                 single_flight=single_flight,
+                                 circuit_breaker=circuit_breaker)
         self.session.verify = validate_certs
+        self.session.authenticator = self
+        self.session_cache = session_cache
+        self.capabilities_cache = capabilities_cache or DEFAULT_CAPABILITIES_CACHE
+        self.capabilities = None
+        self.version = None
 
     def login(self):
         """Executes login tasks against vManage to retrieve token(s).
@@ -50,8 +122,34 @@ class Authentication(object):
             None.
 
         Returns:
-            self.session: a Requests session with JSESSIONID and an
-            X-XSRF-TOKEN for vManage version >= 19.2.0.
+            self.session: a Transport (Requests session) with JSESSIONID
+            and an X-XSRF-TOKEN for vManage version >= 19.2.0.
+
+        Raises:
+            LoginFailure: If the username/password are incorrect.
+            RequestException: If the host is not accessible.
+
+        """
+
+        if self.session_cache and self.restore_session():
+            return self.session
+
+        return self.authenticate()
+
+    def authenticate(self, refresh_capabilities=False):
+        """Authenticates against vManage, ignoring any cached session.
+
+        Also used by the transport to re-authenticate when the session
+        expires.
+
+        Args:
+            refresh_capabilities (bool): Probe the vManage version again
+                instead of using the capabilities cache, e.g. because
+                the session expired and vManage may have been upgraded
+
+        Returns:
+            self.session: a Transport (Requests session) with JSESSIONID
+            and an X-XSRF-TOKEN for vManage version >= 19.2.0.
 
         Raises:
             LoginFailure: If the username/password are incorrect.
@@ -72,9 +170,13 @@ class Authentication(object):
             if (response.status_code != 200 or response.text.startswith('<html>')):
                 raise Exception('Login failed, check user credentials.')
 
-            version = Utilities(self.session, self.host).get_vmanage_version()
+            capabilities = None if refresh_capabilities else self.capabilities_cache.get(self.host, self.port)
+            if capabilities is None:
+                version = Utilities(self.session, self.host, self.port).get_vmanage_version()
+                capabilities = self.capabilities_cache.set(self.host, self.port, version)
+            self.set_capabilities(capabilities)
 
-            if version >= '19.2.0':
+            if capabilities.supports('xsrf_token'):
                 api = 'client/token'
                 url = f'{self.base_url}{api}'
                 response = self.session.get(url=url, timeout=self.timeout)
@@ -83,4 +185,74 @@ class Authentication(object):
         except requests.exceptions.RequestException as e:
             raise Exception(f'Could not connect to {self.host}: {e}')
 
+        if self.session_cache:
+            self.save_session()
+
         return self.session
+
+    def save_session(self):
+        """Save the current session to the session cache.
+
+        """
+        cookies = [{
+            'name': cookie.name,
+            'value': cookie.value,
+            'domain': cookie.domain,
+            'path': cookie.path
+        } for cookie in self.session.cookies]
+        xsrf_token = self.session.headers.get('X-XSRF-TOKEN')
+        if isinstance(xsrf_token, bytes):
+            xsrf_token = xsrf_token.decode()
+        self.session_cache.save(self.host, self.port, self.user, cookies, xsrf_token=xsrf_token, version=self.version)
+
+    def set_capabilities(self, capabilities):
+        """Record the capabilities of vManage on this object and the transport.
+
+        """
+        self.capabilities = capabilities
+        self.version = str(capabilities.version)
+        self.session.capabilities = capabilities
+
+    def restore_session(self):
+        """Restore a session from the session cache.
+
+        No request is made: if the cached session has expired, the first
+        API call through the transport re-authenticates transparently.
+        Entries without a vManage version are validated with a single
+        request and discarded if vManage answers with a login page or a
+        401/403, so that login() authenticates again.
+
+        Returns:
+            result (bool): True if a session was restored.
+        """
+
+        entry = self.session_cache.load(self.host, self.port, self.user)
+        if not entry:
+            return False
+
+        for cookie in entry['cookies']:
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+        if entry.get('xsrf_token'):
+            self.session.headers['X-XSRF-TOKEN'] = entry['xsrf_token']
+
+        version = entry.get('version')
+        if not version:
+            try:
+                url = f'{self.base_url}system/device/controllers?model=vmanage&&&&'
+                response = self.session.get(url=url, timeout=self.timeout)
+                result_json = response.json() if response.status_code == 200 else None
+            except (requests.exceptions.RequestException, ValueError):
+                result_json = None
+
+            if not result_json or not result_json.get('data'):
+                self.session_cache.delete(self.host, self.port, self.user)
+                self.session.cookies.clear()
+                self.session.headers.pop('X-XSRF-TOKEN', None)
+                return False
+            version = result_json['data'][0]['version']
+
+        capabilities = self.capabilities_cache.get(self.host, self.port, version=version)
+        if capabilities is None:
+            capabilities = self.capabilities_cache.set(self.host, self.port, version)
+        self.set_capabilities(capabilities)
+        return True
@@ -0,0 +1,199 @@
+"""Cisco vManage Version and Capabilities.
+"""
+
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+from vmanage.api.session_cache import default_cache_dir, write_private_json
+
+DEFAULT_TTL = 3600
+
+# Feature flag -> minimum vManage version
+FEATURES = {
+    'security_policy': '18.2.0',
+    'utd_security_policy': '18.4.0',
+    'xsrf_token': '19.2.0',
+}
+
+
+@functools.total_ordering
+class Version(object):
+    """Comparable vManage Version
+
+    Parses versions such as '19.2.097' or '20.3.1.1' into numeric
+    components so that '18.30.0' sorts after '18.4.0'.  Compares with
+    other Version objects or with version strings.
+
+    """
+    def __init__(self, version):
+        self.version = str(version)
+        components = []
+        for component in self.version.split('.'):
+            match = re.match(r'\d+', component)
+            components.append(int(match.group()) if match else 0)
+        self.components = tuple(components)
+
+    def _key(self, other):
+        if not isinstance(other, Version):
+            other = Version(other)
+        length = max(len(self.components), len(other.components))
+        return (self.components + (0, ) * (length - len(self.components)),
+                other.components + (0, ) * (length - len(other.components)))
+
+    def __eq__(self, other):
+        mine, theirs = self._key(other)
+        return mine == theirs
+
+    def __lt__(self, other):
+        mine, theirs = self._key(other)
+        return mine < theirs
+
+    def __hash__(self):
+        return hash(self.components)
+
+    def __str__(self):
+        return self.version
+
+    def __repr__(self):
+        return f"Version('{self.version}')"
+
+
+class Capabilities(object):
+    """vManage Capabilities
+
+    The parsed version of a vManage along with the feature flags that
+    follow from it, so callers can branch on features rather than
+    comparing version strings.
+
+    """
+    def __init__(self, version):
+        """Initialize Capabilities object.
+
+        Args:
+            version (str): The vManage version
+
+        """
+
+        self.version = Version(version)
+        self.features = {feature: self.version >= minimum for feature, minimum in FEATURES.items()}
+
+    def supports(self, feature):
+        """Whether this vManage supports a feature from FEATURES.
+
+        """
+        return self.features.get(feature, False)
+
+
+class CapabilitiesCache(object):
+    """Capabilities Cache
+
+    Caches the Capabilities of each vManage host for ttl seconds so that
+    the version is probed once per host rather than on every login.
+    Versions are kept in memory only, unless persist is True: then they
+    are also kept on disk (mode 0600) and shared between processes, such
+    as CLI invocations or Ansible tasks.
+
+    A cached version is dropped as soon as vManage is seen to report a
+    different one (see get), and Authentication probes the version
+    again whenever an expired session is re-authenticated, which is what
+    an upgrade causes.
+
+    """
+    def __init__(self, ttl=DEFAULT_TTL, persist=False, cache_dir=None):
+        """Initialize CapabilitiesCache object.
+
+        Args:
+            ttl (int): seconds a cached version stays valid, default 3600
+            persist (bool): keep versions on disk, default False
+            cache_dir (str): directory for the persisted versions,
+                default ~/.cache/vmanage
+
+        """
+
+        self.ttl = ttl
+        self.persist = persist
+        self.path = os.path.join(cache_dir or default_cache_dir(), 'capabilities.json')
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(host, port):
+        return f'{host}:{port}'
+
+    def _load_persisted(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, host, port, version=None):
+        """Get the cached Capabilities of a vManage.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            port (int): HTTPS port of vManage
+            version (str): The version vManage currently reports, if
+                known.  A cached entry for another version is dropped.
+
+        Returns:
+            result (obj): Capabilities, or None if not cached, expired or
+                cached for another version.
+        """
+
+        key = self.key(host, port)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.persist:
+                entry = self._load_persisted().get(key)
+            if not entry or time.time() - entry.get('fetched', 0) > self.ttl:
+                return None
+            if version is not None and entry.get('version') != str(version):
+                self._drop(key)
+                return None
+            self._entries[key] = entry
+            return Capabilities(entry['version'])
+
+    def set(self, host, port, version):
+        """Cache the version of a vManage.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            port (int): HTTPS port of vManage
+            version (str): The vManage version
+
+        Returns:
+            result (obj): Capabilities for the version.
+        """
+
+        key = self.key(host, port)
+        entry = {'version': str(version), 'fetched': time.time()}
+        with self._lock:
+            self._entries[key] = entry
+            if self.persist:
+                entries = self._load_persisted()
+                entries[key] = entry
+                write_private_json(self.path, entries)
+        return Capabilities(version)
+
+    def invalidate(self, host, port):
+        """Drop the cached version of a vManage.
+
+        """
+        with self._lock:
+            self._drop(self.key(host, port))
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        if self.persist:
+            entries = self._load_persisted()
+            if entries.pop(key, None) is not None:
+                write_private_json(self.path, entries)
+
+
+DEFAULT_CAPABILITIES_CACHE = CapabilitiesCache()
@@ -0,0 +1,187 @@
+"""Per Host Circuit Breaker for Cisco vManage API Interaction.
+"""
+
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30
+FAILURE_STATUS_CODES = [500, 502, 503, 504]
+
+
+class _Circuit(object):
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.slow_calls = 0
+        self.opened_at = None
+        self.probes = 0
+
+
+class CircuitBreaker(object):
+    """Per Host Circuit Breaker
+
+    Tracks the health of each vManage host (scheme, host and port) a
+    Transport talks to.  A circuit opens after failure_threshold
+    consecutive failures (connection errors, timeouts and 5xx
+    responses), or after slow_call_threshold consecutive calls slower
+    than latency_threshold seconds.  While it is open, HttpMethods fails
+    calls to that host immediately instead of waiting for them to time
+    out.
+
+    After reset_timeout seconds the circuit is half open: up to
+    half_open_max_calls probe calls are let through.  A successful
+    probe closes the circuit again, a failed one re-opens it for
+    another reset_timeout.
+
+    """
+    def __init__(self,
+                 failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 latency_threshold=None,
+                 slow_call_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 half_open_max_calls=1,
+                 failure_status_codes=None):
+        """Initialize CircuitBreaker object.
+
+        Args:
+            failure_threshold (int): consecutive failures that open the
+                circuit, default 5
+            latency_threshold (float): seconds after which a call counts
+                as slow, default None (latency is not considered)
+            slow_call_threshold (int): consecutive slow calls that open
+                the circuit, default 5
+            reset_timeout (float): seconds an open circuit waits before
+                letting a probe through, default 30
+            half_open_max_calls (int): probes let through at a time
+                while half open, default 1
+            failure_status_codes (list): response status codes counted
+                as failures, default FAILURE_STATUS_CODES
+
+        """
+
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_status_codes = failure_status_codes or FAILURE_STATUS_CODES
+        self.transitions = Counter()
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url):
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}'
+
+    def _circuit(self, url):
+        host = self.host(url)
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit()
+        return circuit
+
+    def _set_state(self, circuit, url, state):
+        if circuit.state != state:
+            self.transitions[(self.host(url), state)] += 1
+        circuit.state = state
+        if state == OPEN:
+            circuit.opened_at = time.monotonic()
+        elif state == CLOSED:
+            circuit.failures = 0
+            circuit.slow_calls = 0
+        circuit.probes = 0
+
+    def allow(self, url):
+        """Whether a call to the host of url may be sent now.
+
+        Args:
+            url (str): URL of the API service being called
+
+        Returns:
+            result (bool): False if the call should fail fast.
+        """
+
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state == OPEN:
+                if time.monotonic() - circuit.opened_at < self.reset_timeout:
+                    return False
+                self._set_state(circuit, url, HALF_OPEN)
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.half_open_max_calls:
+                    return False
+                circuit.probes += 1
+            return True
+
+    def record_success(self, url, elapsed=None):
+        """Record a call that got a response.
+
+        Args:
+            url (str): URL of the API service called
+            elapsed (float): seconds until the response arrived
+
+        """
+
+        with self._lock:
+            circuit = self._circuit(url)
+            if self.latency_threshold is not None and elapsed is not None and elapsed > self.latency_threshold:
+                circuit.slow_calls += 1
+                if circuit.state == HALF_OPEN or circuit.slow_calls >= self.slow_call_threshold:
+                    self._set_state(circuit, url, OPEN)
+                    return
+            else:
+                circuit.slow_calls = 0
+            circuit.failures = 0
+            if circuit.state == HALF_OPEN:
+                self._set_state(circuit, url, CLOSED)
+
+    def record_failure(self, url):
+        """Record a call that failed.
+
+        Args:
+            url (str): URL of the API service called
+
+        """
+
+        with self._lock:
+            circuit = self._circuit(url)
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                self._set_state(circuit, url, OPEN)
+
+    def record_response(self, url, status_code, elapsed=None):
+        """Record a response, as a failure if its status code is one of
+        failure_status_codes.
+
+        """
+        if status_code in self.failure_status_codes:
+            self.record_failure(url)
+        else:
+            self.record_success(url, elapsed)
+
+    def state(self, url):
+        """The state of the circuit for the host of url.
+
+        Returns:
+            result (str): CLOSED, OPEN or HALF_OPEN.
+        """
+
+        with self._lock:
+            return self._circuit(url).state
+
+    def retry_in(self, url):
+        """Seconds until an open circuit lets a probe through.
+
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state != OPEN:
+                return 0
+            return max(0, self.reset_timeout - (time.monotonic() - circuit.opened_at))
@@ -0,0 +1,302 @@
+"""Cisco vManage Cluster Load Balancing.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from vmanage.api.authentication import Authentication
+from vmanage.api.circuit_breaker import FAILURE_STATUS_CODES
+from vmanage.api.http_methods import session_expired
+
+ROUND_ROBIN = 'round_robin'
+LEAST_OUTSTANDING = 'least_outstanding'
+# Real time monitoring and statistics reads
+DEFAULT_BALANCED_PREFIXES = ['device/', 'statistics/', 'alarms', 'event']
+# Action status is only known to the node that started the action
+DEFAULT_PINNED_PREFIXES = ['device/action/']
+DEFAULT_NODE_COOLDOWN = 30
+# Responses that take a node out of rotation
+NODE_FAILURE_STATUS_CODES = [429] + FAILURE_STATUS_CODES
+
+
+class ClusterNode(object):
+    """vManage Cluster Node
+
+    An authenticated Transport for one node of a vManage cluster, along
+    with the load balancing state of the node.
+
+    """
+    def __init__(self, host, port, session):
+        self.host = host
+        self.port = port
+        self.session = session
+        self.netloc = f'{host}:{port}'
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.down_until = 0
+
+
+class ClusterTransport(object):
+    """Load Balancing Transport for a vManage Cluster
+
+    Holds an authenticated Transport per cluster node and is accepted
+    anywhere the API classes expect a session; the API classes are
+    created with the host of the first (primary) node as usual.
+
+    Read-only monitoring GETs (those under balanced_prefixes) are spread
+    across the nodes, round robin or to the node with the fewest
+    requests outstanding.  Everything else, writes, configuration reads
+    and action status polling (pinned_prefixes), goes to the primary
+    node so it sees its own changes.  A node that fails with a
+    connection error is skipped for node_cooldown seconds and the call
+    is retried on the primary.  A node that answers with one of
+    NODE_FAILURE_STATUS_CODES is skipped for node_cooldown seconds too.
+
+    Retries, rate limiting, request hooks and the other Transport
+    features of the primary node apply to every call.  An expired
+    session is re-authenticated on the node that served the request,
+    and the response is recorded on the circuit of that node's host.
+
+    """
+    def __init__(self,
+                 nodes,
+                 strategy=ROUND_ROBIN,
+                 balanced_prefixes=None,
+                 pinned_prefixes=None,
+                 node_cooldown=DEFAULT_NODE_COOLDOWN):
+        """Initialize ClusterTransport object.
+
+        Args:
+            nodes (list): ClusterNode objects, the primary node first
+            strategy (str): ROUND_ROBIN or LEAST_OUTSTANDING, default
+                ROUND_ROBIN
+            balanced_prefixes (list): API paths (relative to
+                /dataservice/) of GETs spread across nodes, default
+                DEFAULT_BALANCED_PREFIXES
+            pinned_prefixes (list): API paths always sent to the primary
+                node, default DEFAULT_PINNED_PREFIXES
+            node_cooldown (float): seconds a failed node is skipped,
+                default 30
+
+        """
+
+        if strategy not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise Exception(f'Unknown load balancing strategy {strategy}, use {ROUND_ROBIN} or {LEAST_OUTSTANDING}')
+        self.nodes = list(nodes)
+        self.primary = self.nodes[0]
+        self.strategy = strategy
+        self.balanced_prefixes = list(DEFAULT_BALANCED_PREFIXES if balanced_prefixes is None else balanced_prefixes)
+        self.pinned_prefixes = list(DEFAULT_PINNED_PREFIXES if pinned_prefixes is None else pinned_prefixes)
+        self.node_cooldown = node_cooldown
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        # The node that served the last request of each thread
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        # Everything else (headers, retry_policy, ...) is the primary
+        # node's
+        primary = self.__dict__.get('primary')
+        if primary is None:
+            raise AttributeError(name)
+        return getattr(primary.session, name)
+
+    def balanced(self, method, url):
+        """Whether a call may be sent to any node.
+
+        """
+        parts = urlsplit(url)
+        if method.upper() != 'GET' or parts.netloc != self.primary.netloc:
+            return False
+        path = parts.path.split('/dataservice/', 1)[-1]
+        if any(path.startswith(prefix) for prefix in self.pinned_prefixes):
+            return False
+        return any(path.startswith(prefix) for prefix in self.balanced_prefixes)
+
+    @property
+    def auth_generation(self):
+        """The auth_generation of every node, in node order.
+
+        """
+        return tuple(node.session.auth_generation for node in self.nodes)
+
+    def reauthenticate(self, generation):
+        """Re-authenticate the node that served this thread's last request.
+
+        Args:
+            generation (tuple): The auth_generation the expired request
+                was sent with.
+
+        Returns:
+            result (bool): True if the request should be replayed.
+        """
+
+        node = getattr(self._local, 'node', self.primary)
+        return node.session.reauthenticate(generation[self.nodes.index(node)])
+
+    def select(self, method, url):
+        """Choose the node for a call.
+
+        Returns:
+            result (obj): ClusterNode.
+        """
+
+        balanced = self.balanced(method, url)
+        now = time.monotonic()
+        with self._lock:
+            if not balanced:
+                node = self.primary
+            else:
+                candidates = [node for node in self.nodes if node.down_until <= now] or [self.primary]
+                if self.strategy == ROUND_ROBIN:
+                    node = candidates[next(self._counter) % len(candidates)]
+                else:
+                    node = min(candidates, key=lambda candidate: (candidate.outstanding, candidate.requests))
+            node.outstanding += 1
+            node.requests += 1
+        return node
+
+    def request(self, method, url, **kwargs):
+        """Send a request to the node chosen for it.
+
+        Takes the arguments of requests.Session.request.  A request sent
+        to a node other than the primary is re-authenticated on that
+        node if its session has expired.
+
+        """
+        node = self.select(method, url)
+        self._local.node = node
+        try:
+            if node is self.primary:
+                return node.session.request(method, url, **kwargs)
+            node_url = urlsplit(url)._replace(netloc=node.netloc).geturl()
+            generation = node.session.auth_generation
+            response = node.session.request(method, node_url, **kwargs)
+            if session_expired(response) and node.session.reauthenticate(generation):
+                response.close()
+                response = node.session.request(method, node_url, **kwargs)
+            if response.status_code in NODE_FAILURE_STATUS_CODES:
+                self.mark_down(node)
+            return response
+        except requests.exceptions.RequestException:
+            self.mark_down(node)
+            with self._lock:
+                self.primary.outstanding += 1
+                self.primary.requests += 1
+            self._local.node = self.primary
+            try:
+                return self.primary.session.request(method, url, **kwargs)
+            finally:
+                with self._lock:
+                    self.primary.outstanding -= 1
+        finally:
+            with self._lock:
+                node.outstanding -= 1
+
+    def mark_down(self, node):
+        """Skip a failed node for node_cooldown seconds.
+
+        """
+        with self._lock:
+            node.failures += 1
+            node.down_until = time.monotonic() + self.node_cooldown
+
+    def node_stats(self):
+        """The load balancing state of each node.
+
+        Returns:
+            result (dict): host:port -> requests, outstanding, failures and
+                whether the node is currently skipped.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            return {
+                node.netloc: {
+                    'requests': node.requests,
+                    'outstanding': node.outstanding,
+                    'failures': node.failures,
+                    'down': node.down_until > now,
+                }
+                for node in self.nodes
+            }
+
+    def close(self):
+        for node in self.nodes:
+            node.session.close()
+
+
+class ClusterAuthentication(object):
+    """vManage Cluster Authentication
+
+    Logs in to every node of a vManage cluster (in parallel) and returns
+    a ClusterTransport.
+
+    """
+    def __init__(self,
+                 hosts=None,
+                 user=None,
+                 password=None,
+                 port=443,
+                 strategy=ROUND_ROBIN,
+                 balanced_prefixes=None,
+                 pinned_prefixes=None,
+                 node_cooldown=DEFAULT_NODE_COOLDOWN,
+                 **kwargs):
+        """Initialize ClusterAuthentication object.
+
+        Args:
+            hosts (list): hostnames or IP addresses of the cluster
+                nodes, the primary node first
+            user (str): username for authentication
+            password (str): password for authentication
+            port (int): default HTTPS port 443
+            strategy (str): ROUND_ROBIN or LEAST_OUTSTANDING, default
+                ROUND_ROBIN
+            balanced_prefixes (list): see ClusterTransport
+            pinned_prefixes (list): see ClusterTransport
+            node_cooldown (float): see ClusterTransport
+            kwargs: Passed through to Authentication for every node
+                (validate_certs, pool_maxsize, retry_policy, ...)
+
+        """
+
+        if not hosts:
+            raise Exception('At least one vManage cluster node is required')
+        self.hosts = list(hosts)
+        self.user = user
+        self.password = password
+        self.port = port
+        self.strategy = strategy
+        self.balanced_prefixes = balanced_prefixes
+        self.pinned_prefixes = pinned_prefixes
+        self.node_cooldown = node_cooldown
+        self.kwargs = kwargs
+
+    def login(self):
+        """Log in to every cluster node.
+
+        Returns:
+            result (obj): ClusterTransport.
+
+        Raises:
+            Exception: If logging in to any node fails.
+        """
+
+        def login_node(host):
+            session = Authentication(host=host, user=self.user, password=self.password, port=self.port,
+                                     **self.kwargs).login()
+            return ClusterNode(host, self.port, session)
+
+        with ThreadPoolExecutor(max_workers=len(self.hosts)) as executor:
+            nodes = list(executor.map(login_node, self.hosts))
+        return ClusterTransport(nodes,
+                                strategy=self.strategy,
+                                balanced_prefixes=self.balanced_prefixes,
+                                pinned_prefixes=self.pinned_prefixes,
+                                node_cooldown=self.node_cooldown)
@@ -0,0 +1,117 @@
+"""HTTP Compression for Cisco vManage API Interaction.
+"""
+
+import gzip
+import zlib
+
+ACCEPT_ENCODING = 'gzip, deflate'
+DEFAULT_COMPRESS_MIN_SIZE = 4096
+DEFAULT_COMPRESS_LEVEL = 6
+DECODABLE_ENCODINGS = ['gzip', 'x-gzip', 'deflate']
+
+
+def compress_body(data, min_size=DEFAULT_COMPRESS_MIN_SIZE, level=DEFAULT_COMPRESS_LEVEL):
+    """Gzip a request body if it is large enough to be worth it.
+
+    Args:
+        data (obj): The request body
+        min_size (int): Smallest body (in bytes) to compress
+        level (int): gzip compression level, default 6
+
+    Returns:
+        result (bytes): The compressed body, or None if the body is not
+            a str/bytes payload of at least min_size bytes.
+    """
+
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if not isinstance(data, bytes) or len(data) < min_size:
+        return None
+    return gzip.compress(data, compresslevel=level)
+
+
+class DeflateDecoder(object):
+    """Deflate Decoder
+
+    Decodes a Content-Encoding: deflate body whether or not it has the
+    zlib header, as urllib3 does: the body is first decoded as zlib
+    data, and if its first chunk fails to decode, again as raw deflate
+    data.
+
+    """
+    def __init__(self):
+        self._first_try = True
+        self._data = b''
+        self._obj = zlib.decompressobj()
+
+    def decompress(self, data):
+        if not data or not self._first_try:
+            return self._obj.decompress(data)
+        self._data += data
+        try:
+            decompressed = self._obj.decompress(data)
+            if decompressed:
+                self._first_try = False
+                self._data = None
+            return decompressed
+        except zlib.error:
+            # No zlib header, raw deflate data
+            self._first_try = False
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            try:
+                return self.decompress(self._data)
+            finally:
+                self._data = None
+
+    def flush(self):
+        return self._obj.flush()
+
+
+def decoder_for(encoding):
+    """A decompressor for a Content-Encoding from DECODABLE_ENCODINGS.
+
+    """
+    if encoding == 'deflate':
+        return DeflateDecoder()
+    # wbits MAX_WBITS | 32 accepts both gzip and zlib headers
+    return zlib.decompressobj(zlib.MAX_WBITS | 32)
+
+
+def iter_body(response, chunk_size):
+    """Read a response body, measuring its size on the wire.
+
+    Bodies that are identity, gzip or deflate encoded are read raw from
+    the connection and decompressed here, so both the compressed and
+    decompressed sizes are known.  Anything else (a body that has
+    already been read, or another encoding) is left to Requests and its
+    wire size is reported as None.
+
+    Args:
+        response (obj): Requests response object sent with stream=True
+        chunk_size (int): Bytes read from the socket at a time
+
+    Returns:
+        result (generator): (wire bytes, decoded chunk) pairs.
+
+    Raises:
+        ValueError: The body cannot be decompressed.
+    """
+
+    encoding = response.headers.get('Content-Encoding', '').strip().lower()
+    raw = response.raw
+    consumed = response._content is not False  # pylint: disable=protected-access
+    if consumed or not hasattr(raw, 'stream') or encoding not in DECODABLE_ENCODINGS + ['', 'identity']:
+        content = response.content
+        yield (None if encoding not in ('', 'identity') else len(content)), content
+        return
+
+    decompressor = decoder_for(encoding) if encoding in DECODABLE_ENCODINGS else None
+    try:
+        for chunk in raw.stream(chunk_size, decode_content=False):
+            yield len(chunk), decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor:
+            tail = decompressor.flush()
+            if tail:
+                yield 0, tail
+    except zlib.error as e:
+        raise ValueError(f'Invalid {encoding} response body: {e}')
@@ -3,7 +3,7 @@
 
 from vmanage.api.http_methods import HttpMethods
 from vmanage.data.parse_methods import ParseMethods
-from vmanage.utils import list_to_dict
+from vmanage.utils import list_to_dict, map_devices, DEFAULT_MAX_WORKERS
 
 
 class Device(object):
@@ -60,17 +60,23 @@ class Device(object):
         result = ParseMethods.parse_status(response)
         return result
 
-    def get_device_status_list(self):
+    def get_device_status_list(self, stream=False):
         """Obtain a list of specified device type
 
-        Args: None
+        Args:
+            stream (bool): Yield the devices one at a time as they are
+                received rather than loading the whole response,
+                default False
 
         Returns:
-            result (list): Device status
+            result (list): Device status, or a generator of it when
+                stream is True.
         """
 
         api = f"device/"
         url = self.base_url + api
+        if stream:
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
@@ -192,3 +198,25 @@ class Device(object):
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
+
+    def map(self, method, system_ips, *args, max_workers=DEFAULT_MAX_WORKERS):
+        """Run a per-device method for many devices concurrently.
+
+        The system IP is passed as the last argument, so
+        map('get_device_data', system_ips, 'interface') calls
+        get_device_data('interface', system_ip) for every device.
+
+        Args:
+            method (str or callable): Method name or bound method
+            system_ips (list): Device System IPs
+            args: Leading positional arguments for method
+            max_workers (int): Maximum number of concurrent requests
+
+        Returns:
+            result (generator): DeviceResult(system_ip, result, error)
+                tuples in order of completion.
+        """
+
+        if isinstance(method, str):
+            method = getattr(self, method)
+        return map_devices(method, system_ips, *args, max_workers=max_workers)
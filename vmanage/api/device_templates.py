@@ -1,12 +1,58 @@
 """Cisco vManage Device Templates API Methods.
 """
 
+import copy
 import json
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 from vmanage.api.feature_templates import FeatureTemplates
 from vmanage.api.http_methods import HttpMethods
 from vmanage.data.parse_methods import ParseMethods
-from vmanage.utils import list_to_dict
+from vmanage.utils import list_to_dict, DEFAULT_MAX_WORKERS
+
+DEFAULT_TEMPLATE_CACHE_SIZE = 4096
+
+
+class TemplateObjectCache(object):
+    """Device Template Object Cache
+
+    Caches device template objects by vManage, templateId and
+    lastUpdatedOn, so an unchanged template is only fetched once however
+    often the template list is read.  A template that is edited gets a
+    new lastUpdatedOn and so is fetched again.  Copies are handed out
+    since callers modify the objects they get.
+
+    """
+    def __init__(self, max_entries=DEFAULT_TEMPLATE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            obj = self._entries.get(key)
+            if obj is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(obj)
+
+    def set(self, key, obj):
+        obj = copy.deepcopy(obj)
+        with self._lock:
+            self._entries[key] = obj
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+DEFAULT_TEMPLATE_OBJECT_CACHE = TemplateObjectCache()
 
 
 class DeviceTemplates(object):
@@ -31,6 +77,7 @@ class DeviceTemplates(object):
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
         self.feature_templates = FeatureTemplates(self.session, self.host, self.port)
+        self.template_object_cache = DEFAULT_TEMPLATE_OBJECT_CACHE
 
     def delete_device_template(self, templateId):
         """Obtain a list of all configured device templates.
@@ -82,28 +129,67 @@ class DeviceTemplates(object):
 
         return {}
 
-    def get_device_template_list(self, factory_default=False, name_list=None):
+    def get_device_template_objects(self, device_templates, max_workers=DEFAULT_MAX_WORKERS):
+        """Obtain the objects of many device templates concurrently.
+
+        Objects are cached by templateId and lastUpdatedOn, so templates
+        that have not changed since they were last fetched are not
+        fetched again.
+
+        Args:
+            device_templates (list): Device templates as listed by
+                get_device_templates()
+            max_workers (int): Maximum number of concurrent requests
+
+        Returns:
+            result (list): The template objects, in the order of
+                device_templates.
+        """
+
+        def get_object(device):
+            key = None
+            if device.get('lastUpdatedOn') is not None:
+                key = (self.host, self.port, device['templateId'], device['lastUpdatedOn'])
+                obj = self.template_object_cache.get(key)
+                if obj is not None:
+                    return obj
+            obj = self.get_device_template_object(device['templateId'])
+            if obj and key is not None:
+                self.template_object_cache.set(key, obj)
+            return obj
+
+        if len(device_templates) <= 1:
+            return [get_object(device) for device in device_templates]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(get_object, device_templates))
+
+    def get_device_template_list(self, factory_default=False, name_list=None, max_workers=DEFAULT_MAX_WORKERS):
         """Get the list of device templates.
 
         Args:
             factory_default (bool): Include factory default
             name_list (list of strings): A list of template names to retreive.
+            max_workers (int): Maximum number of concurrent requests
 
         Returns:
             result (dict): All data associated with a response.
         """
         if name_list is None:
             name_list = []
-        device_templates = self.get_device_templates()
-        return_list = []
-
-        #pylint: disable=too-many-nested-blocks
-        for device in device_templates:
+        # Filter on the listing so only the wanted objects are fetched
+        device_templates = []
+        for device in self.get_device_templates():
             # If there is a list of template name, only return the ones asked for.
             # Otherwise, return them all
             if name_list and device['templateName'] not in name_list:
                 continue
-            obj = self.get_device_template_object(device['templateId'])
+            if not factory_default and device.get('factoryDefault'):
+                continue
+            device_templates.append(device)
+        device_template_objects = self.get_device_template_objects(device_templates, max_workers=max_workers)
+        return_list = []
+
+        for device, obj in zip(device_templates, device_template_objects):
             if obj:
                 if not factory_default and obj['factoryDefault']:
                     continue
@@ -373,12 +459,12 @@ class DeviceTemplates(object):
         }
         url = f"{self.base_url}template/config/device/mode/cli"
         response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
-        ParseMethods.parse_data(response)
+        ParseMethods.parse_status(response)
 
-        if 'json' in response and 'id' in response['json']:
-            action_id = response.json['id']
+        if response['json'] and 'id' in response['json']:
+            action_id = response['json']['id']
         else:
-            raise Exception('Did not get action ID after attaching device to template.')
+            raise Exception('Did not get action ID after detaching device from template.')
         return action_id
 
     def get_attachments(self, template_id, key='host-name'):
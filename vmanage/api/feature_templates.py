@@ -7,6 +7,68 @@ from vmanage.api.http_methods import HttpMethods
 from vmanage.data.parse_methods import ParseMethods
 from vmanage.utils import list_to_dict
 
+# Large fields left out of index only listings
+DEFINITION_KEYS = ['templateDefinition', 'editedTemplateDefinition']
+
+
+class FeatureTemplateRecord(object):
+    """Feature Template Listing Entry
+
+    One entry of the template/feature listing.  The templateDefinition
+    is kept as the JSON string vManage returned and is only decoded the
+    first time definition is read, so walking the listing for names and
+    IDs costs nothing per template.
+
+    """
+    def __init__(self, template):
+        self.template = template
+        self._definition = None
+        self._decoded = False
+
+    @property
+    def template_id(self):
+        return self.template['templateId']
+
+    @property
+    def template_name(self):
+        return self.template['templateName']
+
+    @property
+    def factory_default(self):
+        return self.template.get('factoryDefault', False)
+
+    @property
+    def definition(self):
+        """The decoded templateDefinition, decoded on first access.
+
+        """
+        if not self._decoded:
+            definition = self.template.get('templateDefinition')
+            self._definition = json.loads(definition) if isinstance(definition, (str, bytes)) else definition
+            self._decoded = True
+        return self._definition
+
+    def index(self):
+        """The listing entry without its definitions.
+
+        Returns:
+            result (dict): The template fields other than DEFINITION_KEYS.
+        """
+
+        return {key: value for key, value in self.template.items() if key not in DEFINITION_KEYS}
+
+    def to_dict(self):
+        """The listing entry with its templateDefinition decoded, as
+        returned by get_feature_template_list.
+
+        Returns:
+            result (dict): The feature template.
+        """
+
+        template = self.index()
+        template['templateDefinition'] = self.definition
+        return template
+
 
 class FeatureTemplates(object):
     """vManage Feature Templates API
@@ -101,8 +163,9 @@ class FeatureTemplates(object):
         url = f"{self.base_url}template/feature/{feature_template['templateId']}"
         return HttpMethods(self.session, url).request('PUT', payload=json.dumps(feature_template))
 
-    def get_feature_template_list(self, factory_default=False, name_list=None):
-        """Obtain a list of all configured feature templates.
+    def get_feature_template_records(self, factory_default=False, name_list=None):
+        """Obtain the configured feature templates without decoding their
+        definitions.
 
 
         Args:
@@ -110,7 +173,7 @@ class FeatureTemplates(object):
             name_list (list of strings): A list of the template names to return
 
         Returns:
-            result (dict): All data associated with a response.
+            result (list): FeatureTemplateRecord objects.
 
         """
         if name_list is None:
@@ -119,21 +182,40 @@ class FeatureTemplates(object):
 
         return_list = []
         for template in feature_templates:
-            if not factory_default and template['factoryDefault']:
+            record = FeatureTemplateRecord(template)
+            if not factory_default and record.factory_default:
                 continue
-            if name_list and template['templateName'] not in name_list:
+            if name_list and record.template_name not in name_list:
                 continue
-            template['templateDefinition'] = json.loads(template['templateDefinition'])
-            template.pop('editedTemplateDefinition', None)
-            return_list.append(template)
+            return_list.append(record)
 
         return return_list
 
+    def get_feature_template_list(self, factory_default=False, name_list=None, index_only=False):
+        """Obtain a list of all configured feature templates.
+
+
+        Args:
+            factory_default (bool): Wheter to return factory default templates
+            name_list (list of strings): A list of the template names to return
+            index_only (bool): Leave out templateDefinition (and skip
+                decoding it), for callers that only need names and IDs
+
+        Returns:
+            result (dict): All data associated with a response.
+
+        """
+        records = self.get_feature_template_records(factory_default=factory_default, name_list=name_list)
+        if index_only:
+            return [record.index() for record in records]
+        return [record.to_dict() for record in records]
+
     def get_feature_template_dict(self,
                                   factory_default=False,
                                   key_name='templateName',
                                   remove_key=True,
-                                  name_list=None):
+                                  name_list=None,
+                                  index_only=False):
         """Obtain a dictionary of all configured feature templates.
 
 
@@ -141,13 +223,15 @@ class FeatureTemplates(object):
             factory_default (bool): Wheter to return factory default templates
             key_name (string): The name of the attribute to use as the dictionary key
             remove_key (boolean): remove the search key from the element
+            index_only (bool): Leave out templateDefinition (and skip
+                decoding it), for callers that only need names and IDs
 
         Returns:
             result (dict): All data associated with a response.
 
         """
-        if name_list is None:
-            name_list = []
-        feature_template_list = self.get_feature_template_list(factory_default=factory_default, name_list=name_list)
+        feature_template_list = self.get_feature_template_list(factory_default=factory_default,
+                                                               name_list=name_list,
+                                                               index_only=index_only)
 
         return list_to_dict(feature_template_list, key_name, remove_key)
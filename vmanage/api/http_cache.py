@@ -0,0 +1,216 @@
+"""Conditional GET Cache for Cisco vManage Configuration Endpoints.
+"""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import requests
+
+DEFAULT_TTL = 15
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_CACHEABLE_PREFIXES = [
+    'template/feature',
+    'template/device',
+    'template/policy/list',
+    'template/policy/definition',
+]
+# Device attachments change through endpoints outside these prefixes
+DEFAULT_EXCLUDED_PREFIXES = ['template/device/config/']
+
+
+class CacheEntry(object):
+    """Cached Response
+
+    The body of a successful GET along with its validators.
+
+    """
+    def __init__(self, response, content):
+        self.status_code = response.status_code
+        self.headers = dict(response.headers)
+        self.content = content
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.stored = time.monotonic()
+
+    def validators(self):
+        """Conditional request headers for this entry.
+
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self, url):
+        """A Requests response object holding the cached body.
+
+        """
+        response = requests.models.Response()
+        response.status_code = self.status_code
+        response.headers.update(self.headers)
+        response._content = self.content  # pylint: disable=protected-access
+        response.url = url
+        return response
+
+
+class HttpCache(object):
+    """Conditional GET Cache
+
+    Stores GET responses from configuration endpoints (feature and
+    device templates, policy lists and definitions) along with their
+    ETag / Last-Modified validators.  A cached URL is requested again
+    with If-None-Match / If-Modified-Since, so an unchanged object costs
+    a 304 instead of a full download.  Responses without validators are
+    served from the cache for ttl seconds instead.
+
+    Any POST, PUT or DELETE through the same transport drops every
+    entry, both before it is sent and once it has completed.  A write
+    changes more than the objects under its own path: attaching a
+    template or editing a feature template or policy list changes
+    devicesAttached, attachedMastersCount and references in the lists
+    of other prefixes, so no cached entry is trusted after it.  Each
+    invalidation also moves the cache to a new generation, and a GET
+    response is only stored if the cache is still in the generation it
+    was requested in, so a GET that raced a write never stores the data
+    from before the write.  Bodies are
+    kept as bytes and decoded for each caller, since callers modify the
+    results they are given.
+
+    """
+    def __init__(self,
+                 ttl=DEFAULT_TTL,
+                 prefixes=None,
+                 excluded_prefixes=None,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        """Initialize HttpCache object.
+
+        Args:
+            ttl (int): seconds a response without validators is served
+                from the cache, default 15
+            prefixes (list): API paths (relative to /dataservice/) that
+                are cached, default DEFAULT_CACHEABLE_PREFIXES
+            excluded_prefixes (list): API paths never cached, default
+                DEFAULT_EXCLUDED_PREFIXES
+            max_entries (int): most responses kept, least recently used
+                first out, default 1024
+
+        """
+
+        self.ttl = ttl
+        self.prefixes = list(DEFAULT_CACHEABLE_PREFIXES if prefixes is None else prefixes)
+        self.excluded_prefixes = list(DEFAULT_EXCLUDED_PREFIXES if excluded_prefixes is None else excluded_prefixes)
+        self.max_entries = max_entries
+        self.stats = Counter()
+        self._generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def api_path(url):
+        return url.split('/dataservice/', 1)[-1]
+
+    def prefix_for(self, url):
+        """The cacheable prefix a URL falls under, or None.
+
+        """
+        path = self.api_path(url)
+        for prefix in self.prefixes:
+            if path == prefix or path.startswith((prefix + '/', prefix + '?')):
+                return prefix
+        return None
+
+    def cacheable(self, url):
+        path = self.api_path(url)
+        return self.prefix_for(url) is not None and not any(path.startswith(p) for p in self.excluded_prefixes)
+
+    def get(self, url):
+        """Get the cached entry for a URL.
+
+        Args:
+            url (str): URL of the API service being called
+
+        Returns:
+            result (obj): CacheEntry, or None if not cached.
+        """
+
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def fresh(self, entry):
+        """Whether an entry can be used without asking vManage.
+
+        Only entries without validators are served unconditionally.
+        """
+        return not entry.validators() and time.monotonic() - entry.stored <= self.ttl
+
+    def generation(self):
+        """The invalidation generation of the cache.
+
+        Taken before a GET is sent and passed back to store().
+        """
+        with self._lock:
+            return self._generation
+
+    def store(self, url, response, content, generation=None):
+        """Cache a successful GET response.
+
+        Args:
+            url (str): URL of the API service being called
+            response (obj): Requests response object
+            content (bytes): The decompressed body
+            generation (int): generation() when the GET was sent; the
+                response is not stored if the cache has been
+                invalidated since
+
+        """
+
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return
+        entry = CacheEntry(response, content)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stats['stale'] += 1
+                return
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats['stores'] += 1
+
+    def revalidated(self, url, response):
+        """Record a 304 Not Modified for a cached URL.
+
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return
+            entry.stored = time.monotonic()
+            entry.etag = response.headers.get('ETag') or entry.etag
+            entry.last_modified = response.headers.get('Last-Modified') or entry.last_modified
+
+    def record(self, result):
+        """Count a lookup result: 'hit', 'revalidated' or 'miss'.
+
+        """
+        with self._lock:
+            self.stats[result] += 1
+
+    def invalidate(self):
+        """Drop every entry after a POST, PUT or DELETE.
+
+        """
+        with self._lock:
+            self._generation += 1
+            self.stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,10 +1,42 @@
-import json
+import time
 
 import requests
+import urllib3
+from vmanage.api.compression import ACCEPT_ENCODING, DEFAULT_COMPRESS_MIN_SIZE, compress_body, iter_body
+from vmanage.api.json_decoder import DEFAULT_DECODER
+from vmanage.api.json_stream import iter_array_items
+from vmanage.api.metrics import endpoint_name
 
-STANDARD_HEADERS = {'Connection': 'keep-alive', 'Content-Type': 'application/json'}
+STANDARD_HEADERS = {'Connection': 'keep-alive', 'Content-Type': 'application/json', 'Accept-Encoding': ACCEPT_ENCODING}
 STANDARD_TIMEOUT = 10
+STREAM_CHUNK_SIZE = 65536
 VALID_STATUS_CODES = [200, 201, 202, 203, 204, 205, 206, 207, 208, 226]
+SESSION_EXPIRED_STATUS_CODES = [401, 403]
+COMPRESSIBLE_METHODS = ['POST', 'PUT']
+
+
+def session_expired(response):
+    """Check whether vManage rejected a request because the session expired.
+
+    An expired session is answered with a 401/403 or with the HTML login
+    page instead of JSON.
+
+    Args:
+        response (obj): Requests response object
+
+    Returns:
+        result (bool): True if the session has expired.
+    """
+
+    if response.status_code in SESSION_EXPIRED_STATUS_CODES:
+        return True
+    content_type = response.headers.get('Content-Type', '')
+    if 'text/html' in content_type:
+        return True
+    if 'json' in content_type:
+        # Avoid reading the body, which may be streamed
+        return False
+    return response.content[:64].lstrip().lower().startswith(b'<html')
 
 
 class HttpMethods(object):
@@ -50,14 +82,79 @@ class HttpMethods(object):
             Timeout: The request timed out.
             RequestException: There was an ambiguous exception.
 
+        Retries are made according to the retry_policy of the session
+        (see Transport), if any, and every attempt waits for its
+        rate_limiter budget.  A request rejected because the session
+        expired is replayed once after the transport re-authenticates.
+        A GET identical to one already in flight on the session waits for
+        and shares its response when the session has a single_flight.
+        Each call is reported to the request_hooks of the session.
+
+        """
+
+        request_hooks = getattr(self.session, 'request_hooks', None)
+        info = {'method': method, 'url': self.url}
+        if not request_hooks:
+            return self._coalesced_request(method, headers, payload, files, info)
+
+        info['endpoint'] = endpoint_name(self.url)
+        for hook in request_hooks:
+            hook.before_request(info)
+        start = time.monotonic()
+        try:
+            return self._coalesced_request(method, headers, payload, files, info)
+        except Exception as e:
+            info['error'] = e
+            raise
+        finally:
+            info['elapsed'] = time.monotonic() - start
+            for hook in request_hooks:
+                hook.after_request(info)
+
+    def _coalesced_request(self, method, headers, payload, files, info):
+        """Performs HTTP REST API Call, sharing identical GETs in flight.
+
+        """
+
+        single_flight = getattr(self.session, 'single_flight', None)
+        if single_flight is None or method.upper() != 'GET' or payload or files:
+            return self._request(method, headers, payload, files, info)
+
+        key = (self.url, tuple(sorted((headers or STANDARD_HEADERS).items())))
+        led = []
+
+        def call():
+            led.append(True)
+            return self._request(method, headers, payload, files, info)
+
+        try:
+            result, shared = single_flight.do(key, call)
+        except Exception:
+            if not led:
+                info['coalesced'] = True
+            raise
+        if not shared:
+            return result
+
+        # Callers modify the results they get, so decode a copy of the
+        # shared response for each of them
+        info['coalesced'] = True
+        info['status_code'] = result['status_code']
+        result = dict(result, retries=0)
+        content = result['response'].content
+        if content:
+            decoder = getattr(self.session, 'json_decoder', None) or DEFAULT_DECODER
+            decode_start = time.monotonic()
+            result['json'] = decoder.loads(content)
+            info['decode_seconds'] = time.monotonic() - decode_start
+        return result
+
+    def _request(self, method, headers, payload, files, info):
+        """Performs HTTP REST API Call, recording details in info.
+
         """
 
-        if headers is None:
-            headers = STANDARD_HEADERS
-        result = {}
-        error = None
         data = None
-        details = None
         result_json = None
 
         if payload:
@@ -66,51 +163,314 @@ class HttpMethods(object):
             else:
                 data = payload
 
-        if files:
-            headers = None
+        http_cache = getattr(self.session, 'http_cache', None)
+        write = http_cache is not None and method.upper() != 'GET'
+        cacheable = http_cache is not None and not write and http_cache.cacheable(self.url)
+        entry = None
+        generation = None
+        if write:
+            http_cache.invalidate()
+        elif cacheable:
+            entry = http_cache.get(self.url)
+            generation = http_cache.generation()
 
-        try:
-            response = self.session.request(method,
-                                            self.url,
-                                            headers=headers,
-                                            files=files,
-                                            data=data,
-                                            timeout=STANDARD_TIMEOUT)
-
-        except requests.exceptions.ConnectionError as e:
-            raise Exception(f'Connection error to {self.url}: {e}')
-        except requests.exceptions.HTTPError as e:
-            raise Exception(f'An HTTP error occurred: {e}')
-        except requests.exceptions.URLRequired as e:
-            raise Exception(f'A valid URL is required to make a request: {e}')
-        except requests.exceptions.TooManyRedirects as e:
-            raise Exception(f'Too many redirects: {e}')
-        except requests.exceptions.Timeout as e:
-            raise Exception(f'The request timed out: {e}')
-        except requests.exceptions.RequestException as e:
-            raise Exception(f'There was an ambiguous exception: {e}')
+        if entry is not None and http_cache.fresh(entry):
+            http_cache.record('hit')
+            info['cache'] = 'hit'
+            info['status_code'] = entry.status_code
+            info['retries'] = 0
+            response = entry.to_response(self.url)
+            content = entry.content
+        else:
+            if entry is not None:
+                headers = dict(headers or STANDARD_HEADERS, **entry.validators())
+            try:
+                response = self._send(method, headers, data, files, info, stream=True)
+            finally:
+                if write:
+                    # Drop whatever a concurrent GET stored while the write was in flight
+                    http_cache.invalidate()
+            if entry is not None and response.status_code == 304:
+                response.close()
+                http_cache.revalidated(self.url, response)
+                http_cache.record('revalidated')
+                info['cache'] = 'revalidated'
+                info['bytes_received'] = 0
+                response = entry.to_response(self.url)
+                content = entry.content
+            else:
+                content = self._read_content(response, info)
+                info['bytes_received'] = len(content)
+                if cacheable:
+                    http_cache.record('miss')
+                    info['cache'] = 'miss'
+                    if response.status_code == 200:
+                        http_cache.store(self.url, response, content, generation=generation)
 
-        if response.text:
+        if content:
+            decoder = getattr(self.session, 'json_decoder', None) or DEFAULT_DECODER
+            decode_start = time.monotonic()
             try:
-                result_json = json.loads(response.text)
-            except json.JSONDecodeError as e:
+                result_json = decoder.loads(content)
+            except ValueError as e:
                 raise Exception(f'Payload format error: {e}')
+            finally:
+                info['decode_seconds'] = time.monotonic() - decode_start
 
         result = {
             'status_code': response.status_code,
-            'status': requests.status_codes._codes[response.status_code][0],  #pylint: disable=protected-access
-            'details': details,
-            'error': error,
+            'status': requests.status_codes._codes[response.status_code][0],  # pylint: disable=protected-access
+            'details': None,
+            'error': None,
             'json': result_json,
             'response': response,
+            'retries': info['retries'],
         }
 
         if response.status_code not in VALID_STATUS_CODES:
-            if result_json and 'error' in result_json:
-                details = result_json['error']['details']
-                error = result_json['error']['message']
-                raise Exception(f"{self.url}: Error {result['status_code']} ({result['status']}) - {error}: {details}")
-            else:
-                raise Exception(f"{self.url}: Error {result['status_code']} ({result['status']})")
+            self._raise_for_status(response, result_json)
 
         return result
+
+    def stream(self, method='GET', headers=None, key='data', chunk_size=STREAM_CHUNK_SIZE):
+        """Performs HTTP REST API Call, yielding a large array incrementally.
+
+        The response is read from the socket in chunks and the items of
+        the top level key array (normally 'data') are decoded and
+        yielded one at a time, so very large responses are processed in
+        constant memory.  The request is sent when iteration starts.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            headers (dict): Use standard vManage header provided in
+                module or custom header for specific API interaction
+            key (str): The top level key of the array, default 'data'
+            chunk_size (int): Bytes read from the socket at a time
+
+        Returns:
+            result (generator): The items of the array.
+
+        Raises:
+            Exception: As for request(), or if the response has no such
+                key.
+
+        """
+
+        request_hooks = getattr(self.session, 'request_hooks', None) or []
+        info = {
+            'method': method,
+            'url': self.url,
+            'endpoint': endpoint_name(self.url),
+            'bytes_received': 0,
+            'wire_bytes': 0,
+        }
+        for hook in request_hooks:
+            hook.before_request(info)
+        start = time.monotonic()
+        response = None
+        try:
+            response = self._send(method, headers, None, None, info, stream=True)
+            if response.status_code not in VALID_STATUS_CODES:
+                info['bytes_received'] = len(response.content)
+                try:
+                    result_json = response.json()
+                except ValueError:
+                    result_json = None
+                self._raise_for_status(response, result_json)
+
+            def chunks():
+                for wire_bytes, chunk in iter_body(response, chunk_size):
+                    info['bytes_received'] += len(chunk)
+                    if wire_bytes is None or info['wire_bytes'] is None:
+                        info['wire_bytes'] = None
+                    else:
+                        info['wire_bytes'] += wire_bytes
+                    yield chunk
+
+            try:
+                yield from iter_array_items(chunks(), key)
+            except KeyError:
+                raise Exception(f'{self.url}: No {key} in response')
+            except ValueError as e:
+                raise Exception(f'Payload format error: {e}')
+        except Exception as e:
+            info['error'] = e
+            raise
+        finally:
+            if response is not None:
+                response.close()
+            info['elapsed'] = time.monotonic() - start
+            for hook in request_hooks:
+                hook.after_request(info)
+
+    def _read_content(self, response, info):
+        """Read the whole body of a streamed response, recording its
+        size on the wire.
+
+        Returns:
+            content (bytes): The decompressed body
+
+        """
+
+        chunks = []
+        wire_bytes = 0
+        try:
+            for chunk_wire_bytes, chunk in iter_body(response, STREAM_CHUNK_SIZE):
+                wire_bytes = None if chunk_wire_bytes is None or wire_bytes is None else wire_bytes + chunk_wire_bytes
+                chunks.append(chunk)
+        except ValueError as e:
+            response.close()
+            raise Exception(f'Payload format error: {e}')
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            response.close()
+            self._raise_request_exception(e)
+
+        # Keep response.content/.text/.json() working for callers
+        response._content = b''.join(chunks)  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        info['wire_bytes'] = wire_bytes
+        info['content_encoding'] = response.headers.get('Content-Encoding')
+        return response.content
+
+    def _send(self, method, headers, data, files, info, stream=False):
+        """Sends the request, applying the circuit breaker, retries, rate
+        limiting and re-authentication.  Large POST/PUT bodies are gzipped
+        when the transport has compress_requests set.
+
+        Returns:
+            response (obj): Requests response object
+
+        """
+
+        if headers is None:
+            headers = STANDARD_HEADERS
+
+        retry_policy = getattr(self.session, 'retry_policy', None)
+        rate_limiter = getattr(self.session, 'rate_limiter', None)
+        circuit_breaker = getattr(self.session, 'circuit_breaker', None)
+        can_reauthenticate = hasattr(self.session, 'reauthenticate')
+        attempt = 0
+        body = data
+        body_headers = headers
+        compressed = False
+
+        if files:
+            body_headers = None
+            # File objects cannot be replayed once they have been read
+            retry_policy = None
+            can_reauthenticate = False
+        elif getattr(self.session, 'compress_requests', False) and method.upper() in COMPRESSIBLE_METHODS:
+            compressed_body = compress_body(data, getattr(self.session, 'compress_min_size',
+                                                          DEFAULT_COMPRESS_MIN_SIZE))
+            if compressed_body is not None:
+                body = compressed_body
+                body_headers = dict(headers, **{'Content-Encoding': 'gzip'})
+                compressed = True
+
+        while True:
+            if circuit_breaker and not circuit_breaker.allow(self.url):
+                info['circuit'] = circuit_breaker.state(self.url)
+                info['circuit_rejected'] = True
+                info['retries'] = attempt
+                raise Exception(f'Circuit open for {circuit_breaker.host(self.url)}, not sending {self.url} '
+                                f'(next attempt in {circuit_breaker.retry_in(self.url):.1f}s)')
+            if rate_limiter:
+                rate_limiter.acquire(self.url)
+            generation = getattr(self.session, 'auth_generation', None)
+            sent = time.monotonic()
+            try:
+                response = self.session.request(method,
+                                                self.url,
+                                                headers=body_headers,
+                                                files=files,
+                                                data=body,
+                                                timeout=STANDARD_TIMEOUT,
+                                                stream=stream)
+            except requests.exceptions.RequestException as e:
+                if circuit_breaker:
+                    circuit_breaker.record_failure(self.url)
+                    info['circuit'] = circuit_breaker.state(self.url)
+                if retry_policy and retry_policy.should_retry_exception(method, e, attempt):
+                    retry_policy.record(method, type(e).__name__)
+                    time.sleep(retry_policy.get_delay(attempt))
+                    attempt += 1
+                    continue
+                # Count the retries of calls that fail after all of them
+                info['retries'] = attempt
+                self._raise_request_exception(e)
+
+            if circuit_breaker:
+                # The host that answered, which a ClusterTransport may have
+                # chosen instead of the one in self.url
+                served_url = response.url or self.url
+                circuit_breaker.record_response(served_url, response.status_code, time.monotonic() - sent)
+                info['circuit'] = circuit_breaker.state(served_url)
+            if compressed and response.status_code == 415:
+                # vManage does not accept compressed bodies, stop sending them
+                response.close()
+                self.session.compress_requests = False
+                body = data
+                body_headers = headers
+                compressed = False
+                continue
+            if retry_policy and retry_policy.should_retry_response(method, response, attempt):
+                response.close()
+                retry_policy.record(method, response.status_code)
+                time.sleep(retry_policy.get_delay(attempt, response))
+                attempt += 1
+                continue
+            if can_reauthenticate and session_expired(response):
+                # Replay once with a new session
+                can_reauthenticate = False
+                if self.session.reauthenticate(generation):
+                    response.close()
+                    continue
+            break
+
+        info['status_code'] = response.status_code
+        info['retries'] = attempt
+        if isinstance(body, bytes):
+            info['bytes_sent'] = len(body)
+        elif isinstance(body, str):
+            info['bytes_sent'] = len(body.encode('utf-8'))
+        return response
+
+    def _raise_for_status(self, response, result_json):
+        """Raise an Exception describing an unsuccessful response.
+
+        Args:
+            response (obj): Requests response object
+            result_json (dict): The decoded response, if any
+
+        Raises:
+            Exception: Describing the error.
+        """
+
+        status = requests.status_codes._codes[response.status_code][0]  # pylint: disable=protected-access
+        if result_json and 'error' in result_json:
+            details = result_json['error']['details']
+            error = result_json['error']['message']
+            raise Exception(f"{self.url}: Error {response.status_code} ({status}) - {error}: {details}")
+        raise Exception(f"{self.url}: Error {response.status_code} ({status})")
+
+    def _raise_request_exception(self, e):
+        """Convert a Requests exception into an Exception with context.
+
+        Args:
+            e (obj): The Requests exception
+
+        Raises:
+            Exception: Describing the failure.
+        """
+
+        if isinstance(e, requests.exceptions.ConnectionError):
+            raise Exception(f'Connection error to {self.url}: {e}')
+        if isinstance(e, requests.exceptions.HTTPError):
+            raise Exception(f'An HTTP error occurred: {e}')
+        if isinstance(e, requests.exceptions.URLRequired):
+            raise Exception(f'A valid URL is required to make a request: {e}')
+        if isinstance(e, requests.exceptions.TooManyRedirects):
+            raise Exception(f'Too many redirects: {e}')
+        if isinstance(e, requests.exceptions.Timeout):
+            raise Exception(f'The request timed out: {e}')
+        raise Exception(f'There was an ambiguous exception: {e}')
@@ -0,0 +1,71 @@
+"""JSON Decoders for Cisco vManage API Responses.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonDecoder(object):
+    """JSON Decoder
+
+    Decodes a response body straight from the raw bytes, which avoids
+    building (and charset sniffing) the full response text first.  All
+    decoders raise a ValueError subclass on malformed input.
+
+    """
+    def __init__(self, name, loads):
+        """Initialize JsonDecoder object.
+
+        Args:
+            name (str): name of the decoder
+            loads (callable): function decoding bytes to Python objects
+
+        """
+
+        self.name = name
+        self.loads = loads
+
+    def __repr__(self):
+        return f"JsonDecoder('{self.name}')"
+
+
+DECODERS = {'json': JsonDecoder('json', json.loads)}
+if ujson is not None:
+    DECODERS['ujson'] = JsonDecoder('ujson', ujson.loads)
+if orjson is not None:
+    DECODERS['orjson'] = JsonDecoder('orjson', orjson.loads)
+
+
+def get_decoder(name=None):
+    """Get a JSON decoder by name, or the fastest one installed.
+
+    Args:
+        name (str): 'orjson', 'ujson' or 'json', default None (the
+            fastest available, in that order)
+
+    Returns:
+        result (obj): JsonDecoder.
+
+    Raises:
+        Exception: The named decoder is not installed.
+    """
+
+    if name is None:
+        for preferred in ('orjson', 'ujson', 'json'):
+            if preferred in DECODERS:
+                return DECODERS[preferred]
+    if name not in DECODERS:
+        raise Exception(f'JSON decoder {name} is not available, install it or use one of {", ".join(DECODERS)}')
+    return DECODERS[name]
+
+
+DEFAULT_DECODER = get_decoder()
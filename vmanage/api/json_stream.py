@@ -0,0 +1,124 @@
+"""Incremental JSON Parsing for Large Cisco vManage API Responses.
+"""
+
+import codecs
+import json
+
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = '0123456789+-.eE'
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer(object):
+    """Text buffer over an iterable of byte chunks.
+
+    """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read another chunk, returning False at the end of the stream.
+
+        """
+        if self.eof:
+            return False
+        # Drop what has already been consumed so memory stays bounded
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        for chunk in self.chunks:
+            if chunk:
+                self.text += self.utf8.decode(chunk)
+                return True
+        self.text += self.utf8.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        """The next non-whitespace character, or '' at the end of the stream.
+
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} of the current buffer")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value.
+
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A number running into the end of the buffer may be cut
+                # short, e.g. '3.' parses as 3 before '25' arrives
+                truncated = (isinstance(value, (int, float)) and not isinstance(value, bool)
+                             and (end == len(self.text) or self.text[end] in NUMBER_CHARS))
+                if not truncated or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_array_items(chunks, key='data'):
+    """Yield the items of a top level array in a JSON object one at a time.
+
+    Only one item (plus one network chunk) is held in memory at a time,
+    so arbitrarily large arrays can be processed in constant memory.
+    Values of other top level keys are skipped.
+
+    Args:
+        chunks (iterable): Byte chunks of the JSON document, e.g.
+            response.iter_content()
+        key (str): The top level key of the array, default 'data'
+
+    Returns:
+        result (generator): The items of the array.
+
+    Raises:
+        ValueError: The document is not valid JSON.
+        KeyError: The document has no such key.
+    """
+
+    buf = _Buffer(chunks)
+    buf.expect('{')
+    if buf.peek() == '}':
+        raise KeyError(key)
+    while True:
+        name = buf.value()
+        buf.expect(':')
+        if name == key and buf.peek() == '[':
+            buf.expect('[')
+            if buf.peek() == ']':
+                return
+            while True:
+                yield buf.value()
+                separator = buf.peek()
+                buf.pos += 1
+                if separator == ']':
+                    return
+                if separator != ',':
+                    raise ValueError(f"Expected ',' or ']' in '{key}' array")
+        buf.value()
+        separator = buf.peek()
+        buf.pos += 1
+        if separator == '}':
+            raise KeyError(key)
+        if separator != ',':
+            raise ValueError("Expected ',' or '}' in JSON object")
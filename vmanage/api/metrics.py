@@ -0,0 +1,296 @@
+"""Request Metrics and Tracing Hooks for Cisco vManage API Interaction.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+DEFAULT_LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+DEFAULT_DECODE_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5]
+CIRCUIT_STATES = ['closed', 'open', 'half_open']
+
+ID_SEGMENT = re.compile(r'^([0-9a-fA-F-]{16,}|\d+|\d+\.\d+\.\d+\.\d+|[0-9a-fA-F:]+:[0-9a-fA-F:]+)$')
+UUID = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+
+def endpoint_name(url):
+    """Name the endpoint of a URL for grouping metrics.
+
+    The path is taken relative to /dataservice/, the query string is
+    dropped and path segments that look like identifiers (UUIDs, numbers,
+    IP addresses, action IDs) are replaced by '{id}', so that e.g. every
+    template/device/object/<id> call is counted together.
+
+    Args:
+        url (str): URL of the API service being called
+
+    Returns:
+        result (str): The endpoint name.
+    """
+
+    path = url.split('/dataservice/', 1)[-1].split('?', 1)[0].strip('/')
+    return '/'.join('{id}' if ID_SEGMENT.match(segment) or UUID.search(segment) else segment
+                    for segment in path.split('/'))
+
+
+def label_value(value):
+    """Escape a Prometheus label value.
+
+    Backslashes, double quotes and newlines are escaped as the text
+    exposition format requires.
+
+    Args:
+        value: The label value
+
+    Returns:
+        result (str): The escaped value, without the surrounding quotes.
+    """
+
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestHook(object):
+    """Request Hook
+
+    Base class for objects added to Transport.request_hooks.
+    HttpMethods calls before_request() when a call starts and
+    after_request() when it ends, successfully or not, with the same
+    info dict.  The info dict holds method, url and endpoint, and after
+    the call also elapsed, status_code, bytes_received (decompressed),
+    wire_bytes (as received, None if unknown), content_encoding,
+    bytes_sent, decode_seconds, retries, cache ('hit', 'revalidated' or
+    'miss' when an HttpCache is used), coalesced (True when the response
+    of an identical GET in flight was shared), circuit (the state of the
+    host's circuit when a CircuitBreaker is used), circuit_rejected (True
+    when the call failed fast) and error (the exception raised, if any).
+
+    """
+    def before_request(self, info):
+        pass
+
+    def after_request(self, info):
+        pass
+
+
+class Histogram(object):
+    """Cumulative Histogram
+
+    """
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, cumulative count) pairs, ending with '+Inf'.
+
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + ['+Inf'], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsCollector(RequestHook):
+    """In Memory Metrics Collector
+
+    Collects per-endpoint latency and JSON decode histograms, bytes
+    received (decompressed and on the wire), bytes sent, status code
+    counts, retries and errors for every call made through HttpMethods,
+    and the circuit breaker state of each host.  Add it to
+    Transport.request_hooks and read the results with snapshot() or
+    to_prometheus().
+
+    """
+    def __init__(self, latency_buckets=None, decode_buckets=None):
+        """Initialize MetricsCollector object.
+
+        Args:
+            latency_buckets (list): upper bounds in seconds of the
+                latency histogram, default DEFAULT_LATENCY_BUCKETS
+            decode_buckets (list): upper bounds in seconds of the JSON
+                decode histogram, default DEFAULT_DECODE_BUCKETS
+
+        """
+
+        self.latency_buckets = latency_buckets or DEFAULT_LATENCY_BUCKETS
+        self.decode_buckets = decode_buckets or DEFAULT_DECODE_BUCKETS
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discard everything collected so far.
+
+        """
+        with self._lock:
+            self.latency = defaultdict(lambda: Histogram(self.latency_buckets))
+            self.decode = defaultdict(lambda: Histogram(self.decode_buckets))
+            self.bytes_received = Counter()
+            self.wire_bytes = Counter()
+            self.bytes_sent = Counter()
+            self.status_codes = Counter()
+            self.retries = Counter()
+            self.errors = Counter()
+            self.cache = Counter()
+            self.coalesced = Counter()
+            self.circuit_states = {}
+            self.circuit_rejections = Counter()
+
+    def after_request(self, info):
+        endpoint = info['endpoint']
+        method = info['method'].upper()
+        with self._lock:
+            if info.get('circuit'):
+                parts = urlsplit(info['url'])
+                host = f'{parts.scheme}://{parts.netloc}'
+                self.circuit_states[host] = info['circuit']
+                if info.get('circuit_rejected'):
+                    # Failed fast without a request
+                    self.circuit_rejections[host] += 1
+                    return
+            if info.get('coalesced'):
+                # No request of its own was made
+                self.coalesced[(endpoint, method)] += 1
+                return
+            self.latency[(endpoint, method)].observe(info.get('elapsed', 0))
+            if info.get('decode_seconds') is not None:
+                self.decode[(endpoint, method)].observe(info['decode_seconds'])
+            self.bytes_received[(endpoint, method)] += info.get('bytes_received') or 0
+            # Without a known wire size count the body as received
+            wire_bytes = info.get('wire_bytes')
+            if wire_bytes is None:
+                wire_bytes = info.get('bytes_received') or 0
+            self.wire_bytes[(endpoint, method)] += wire_bytes
+            self.bytes_sent[(endpoint, method)] += info.get('bytes_sent') or 0
+            if info.get('status_code') is not None:
+                self.status_codes[(endpoint, method, info['status_code'])] += 1
+            if info.get('retries'):
+                self.retries[(endpoint, method)] += info['retries']
+            if info.get('error') is not None:
+                self.errors[(endpoint, method)] += 1
+            if info.get('cache'):
+                self.cache[(endpoint, method, info['cache'])] += 1
+
+    def snapshot(self):
+        """A summary of the collected metrics per endpoint.
+
+        Returns:
+            result (dict): (endpoint, method) -> count, total and
+                average seconds, bytes received and on the wire,
+                compression ratio, bytes sent, JSON decode seconds,
+                retries, errors, coalesced calls, status code and cache
+                result counts.
+        """
+
+        with self._lock:
+            result = {}
+            for key, histogram in self.latency.items():
+                decode = self.decode.get(key)
+                result[key] = {
+                    'count': histogram.count,
+                    'seconds': histogram.sum,
+                    'average_seconds': histogram.sum / histogram.count if histogram.count else 0,
+                    'bytes_received': self.bytes_received[key],
+                    'wire_bytes': self.wire_bytes[key],
+                    'compression_ratio':
+                    self.bytes_received[key] / self.wire_bytes[key] if self.wire_bytes[key] else None,
+                    'bytes_sent': self.bytes_sent[key],
+                    'decode_seconds': decode.sum if decode else 0,
+                    'retries': self.retries[key],
+                    'errors': self.errors[key],
+                    'coalesced': self.coalesced[key],
+                    'status_codes': {
+                        status: count
+                        for (endpoint, method, status), count in self.status_codes.items() if (endpoint, method) == key
+                    },
+                    'cache': {
+                        cache: count
+                        for (endpoint, method, cache), count in self.cache.items() if (endpoint, method) == key
+                    },
+                }
+            return result
+
+    def circuits(self):
+        """The last seen circuit breaker state of each host.
+
+        Returns:
+            result (dict): host -> state and number of calls that
+                failed fast.
+        """
+
+        with self._lock:
+            return {
+                host: {
+                    'state': state,
+                    'rejections': self.circuit_rejections[host]
+                }
+                for host, state in self.circuit_states.items()
+            }
+
+    def to_prometheus(self, prefix='vmanage_http'):
+        """Export the collected metrics in the Prometheus text format.
+
+        Args:
+            prefix (str): Metric name prefix, default 'vmanage_http'
+
+        Returns:
+            result (str): The metrics in text exposition format.
+        """
+
+        lines = []
+
+        def labels(endpoint, method, **extra):
+            pairs = [('endpoint', endpoint), ('method', method)] + sorted(extra.items())
+            return '{' + ','.join(f'{name}="{label_value(value)}"' for name, value in pairs) + '}'
+
+        def histogram(name, help_text, histograms):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} histogram')
+            for (endpoint, method), hist in sorted(histograms.items()):
+                for bound, count in hist.cumulative():
+                    lines.append(f'{prefix}_{name}_bucket{labels(endpoint, method, le=bound)} {count}')
+                lines.append(f'{prefix}_{name}_sum{labels(endpoint, method)} {hist.sum}')
+                lines.append(f'{prefix}_{name}_count{labels(endpoint, method)} {hist.count}')
+
+        def counter(name, help_text, counts, label='status'):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for key, count in sorted(counts.items()):
+                extra = {label: key[2]} if len(key) > 2 else {}
+                lines.append(f'{prefix}_{name}{labels(key[0], key[1], **extra)} {count}')
+
+        with self._lock:
+            histogram('request_duration_seconds', 'Time spent on vManage API calls.', self.latency)
+            histogram('json_decode_seconds', 'Time spent decoding vManage API responses.', self.decode)
+            counter('response_bytes_total', 'Bytes received from vManage, decompressed.', self.bytes_received)
+            counter('response_wire_bytes_total', 'Bytes received from vManage on the wire.', self.wire_bytes)
+            counter('request_bytes_total', 'Request body bytes sent to vManage.', self.bytes_sent)
+            counter('responses_total', 'vManage API responses by status code.', self.status_codes)
+            counter('retries_total', 'Retries made for vManage API calls.', self.retries)
+            counter('errors_total', 'vManage API calls that raised an error.', self.errors)
+            counter('coalesced_total', 'vManage API calls answered by an identical call in flight.',
+                    self.coalesced)
+            counter('cache_total', 'HTTP cache results for vManage API calls.', self.cache, label='result')
+            if self.circuit_states:
+                lines.append(f'# HELP {prefix}_circuit_state Circuit breaker state of each vManage host.')
+                lines.append(f'# TYPE {prefix}_circuit_state gauge')
+                for host, current in sorted(self.circuit_states.items()):
+                    for state in CIRCUIT_STATES:
+                        lines.append(f'{prefix}_circuit_state{{host="{label_value(host)}",state="{state}"}} '
+                                     f'{int(state == current)}')
+                lines.append(f'# HELP {prefix}_circuit_rejections_total Calls failed fast by an open circuit.')
+                lines.append(f'# TYPE {prefix}_circuit_rejections_total counter')
+                for host, count in sorted(self.circuit_rejections.items()):
+                    lines.append(f'{prefix}_circuit_rejections_total{{host="{label_value(host)}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
@@ -3,6 +3,7 @@
 
 from vmanage.api.http_methods import HttpMethods
 from vmanage.data.parse_methods import ParseMethods
+from vmanage.utils import map_devices, DEFAULT_MAX_WORKERS
 
 
 class MonitorNetwork(object):
@@ -27,6 +28,24 @@ class MonitorNetwork(object):
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
 
+    def map(self, method, system_ips, max_workers=DEFAULT_MAX_WORKERS):
+        """Run a per-device monitoring method for many devices concurrently.
+
+        Args:
+            method (str or callable): Method name (e.g. 'get_omp_peers')
+                or bound method taking a system IP
+            system_ips (list): Device System IPs
+            max_workers (int): Maximum number of concurrent requests
+
+        Returns:
+            result (generator): DeviceResult(system_ip, result, error)
+                tuples in order of completion.
+        """
+
+        if isinstance(method, str):
+            method = getattr(self, method)
+        return map_devices(method, system_ips, max_workers=max_workers)
+
     def get_control_connections(self, system_ip):
         """Provides current control connections for device.
 
@@ -87,47 +106,65 @@ class MonitorNetwork(object):
         result = ParseMethods.parse_data(response)
         return result
 
-    def get_omp_routes_received(self, system_ip):
+    def get_omp_routes_received(self, system_ip, stream=False):
         """Provides OMP received routes for device.
 
         Args:
             system_ip (str): Device System IP
+            stream (bool): Yield the entries one at a time as they are
+                received rather than loading the whole response,
+                default False
 
         Returns:
-            result (dict): All data associated with a response.
+            result (list): All data associated with a response, or a
+                generator of it when stream is True.
         """
 
         url = f"{self.base_url}device/omp/routes/received?deviceId={system_ip}"
+        if stream:
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
 
-    def get_omp_routes_advertised(self, system_ip):
+    def get_omp_routes_advertised(self, system_ip, stream=False):
         """Provides OMP advertised routes for device.
 
         Args:
             system_ip (str): Device System IP
+            stream (bool): Yield the entries one at a time as they are
+                received rather than loading the whole response,
+                default False
 
         Returns:
-            result (dict): All data associated with a response.
+            result (list): All data associated with a response, or a
+                generator of it when stream is True.
         """
 
         url = f"{self.base_url}device/omp/routes/advertised?deviceId={system_ip}"
+        if stream:
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
 
-    def get_ip_routetable(self, system_ip):
+    def get_ip_routetable(self, system_ip, stream=False):
         """Provides OMP peers for device.
 
         Args:
             system_ip (str): Device System IP
+            stream (bool): Yield the entries one at a time as they are
+                received rather than loading the whole response,
+                default False
 
         Returns:
-            result (dict): All data associated with a response.
+            result (list): All data associated with a response, or a
+                generator of it when stream is True.
         """
 
         url = f"{self.base_url}device/ip/routetable?deviceId={system_ip}"
+        if stream:
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
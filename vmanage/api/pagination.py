@@ -0,0 +1,225 @@
+"""Paginated Queries for Cisco vManage Bulk Data APIs.
+"""
+
+import json
+import queue
+import threading
+from urllib.parse import urlencode
+
+from vmanage.api.http_methods import HttpMethods
+
+DEFAULT_PAGE_SIZE = 10000
+DEFAULT_PREFETCH = 1
+SCROLL = 'scroll'
+OFFSET = 'offset'
+_DONE = object()
+
+
+class PageIterator(object):
+    """Paginated Query Iterator
+
+    Iterates over the records of a vManage paged query such as
+    statistics/interface/page, alarms/page, event/page or auditlog/page,
+    following either the scrollId returned in pageInfo (SCROLL) or an
+    offset query parameter (OFFSET).  Records are yielded one page at a
+    time, so days of statistics can be exported without holding them in
+    memory.
+
+    While the caller processes a page, up to prefetch further pages are
+    fetched in a background thread.  The fetcher blocks once prefetch
+    pages are waiting, so a slow consumer holds back the fetching rather
+    than letting pages pile up.
+
+    After each page has been consumed, checkpoint holds the position of
+    the next page as a JSON serializable dict.  Passing it back as
+    checkpoint resumes the query there.  Note that vManage expires
+    scroll IDs a few minutes after their last use, so SCROLL queries can
+    only be resumed shortly after they stopped.  A scroll moves past
+    every page fetched, consumed or not, so SCROLL queries that
+    checkpoint fetch each page only when it is needed.
+
+    """
+    def __init__(self,
+                 session,
+                 url,
+                 query=None,
+                 method='POST',
+                 mode=SCROLL,
+                 page_size=DEFAULT_PAGE_SIZE,
+                 prefetch=None,
+                 checkpoint=None,
+                 on_checkpoint=None,
+                 offset_param='offset',
+                 size_param='count'):
+        """Initialize PageIterator object.
+
+        Args:
+            session (obj): Requests Session object
+            url (str): URL of the paged API, e.g.
+                https://vmanage:443/dataservice/statistics/interface/page
+            query (dict): vManage query, sent as the body of a POST or
+                as the query parameter of a GET, default None
+            method (str): POST or GET, default POST
+            mode (str): SCROLL (scrollId) or OFFSET pagination, default
+                SCROLL
+            page_size (int): records per page, default 10000.  For
+                SCROLL queries it is set as the query size unless the
+                query has one.
+            prefetch (int): pages fetched ahead of the caller, default
+                1, or 0 for SCROLL queries with checkpoint or
+                on_checkpoint.  0 fetches each page only when it is
+                needed.
+            checkpoint (dict): checkpoint of an earlier iteration to
+                resume from, default None (start at the beginning)
+            on_checkpoint (callable): called with the new checkpoint
+                each time a page has been consumed, e.g. to save it
+            offset_param (str): OFFSET query parameter for the first
+                record, default 'offset'
+            size_param (str): OFFSET query parameter for the page size,
+                default 'count'
+
+        Raises:
+            Exception: If a SCROLL query with checkpoint or
+                on_checkpoint is given prefetch, since resuming it
+                would skip the prefetched pages.
+        """
+
+        if mode not in (SCROLL, OFFSET):
+            raise Exception(f'Unknown pagination mode {mode}, use {SCROLL} or {OFFSET}')
+        checkpointing = checkpoint is not None or on_checkpoint is not None
+        if prefetch is None:
+            prefetch = 0 if mode == SCROLL and checkpointing else DEFAULT_PREFETCH
+        elif prefetch > 0 and mode == SCROLL and checkpointing:
+            raise Exception('SCROLL queries cannot be resumed exactly with prefetch, use prefetch=0 or OFFSET')
+        self.session = session
+        self.url = url
+        self.method = method.upper()
+        self.mode = mode
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.on_checkpoint = on_checkpoint
+        self.offset_param = offset_param
+        self.size_param = size_param
+        self.query = query
+        if mode == SCROLL and query is not None and 'size' not in query:
+            self.query = dict(query, size=page_size)
+        self.checkpoint = dict(checkpoint) if checkpoint else {'scroll_id': None, 'offset': 0, 'done': False}
+        self.pages_fetched = 0
+
+    def __iter__(self):
+        return self.records()
+
+    def page_url(self, position):
+        """The URL of the page at a position.
+
+        """
+        params = {}
+        if self.method == 'GET' and self.query is not None:
+            params['query'] = json.dumps(self.query)
+        if self.mode == SCROLL:
+            if position['scroll_id']:
+                params['scrollId'] = position['scroll_id']
+        else:
+            params[self.offset_param] = position['offset']
+            params[self.size_param] = self.page_size
+        if not params:
+            return self.url
+        separator = '&' if '?' in self.url else '?'
+        return f'{self.url}{separator}{urlencode(params)}'
+
+    def fetch_page(self, position):
+        """Fetch the page at a position.
+
+        Args:
+            position (dict): scroll_id and offset of the page, as in
+                checkpoint
+
+        Returns:
+            result (tuple): The records of the page, and the position of
+                the next page (with done set after the last page).
+        """
+
+        payload = json.dumps(self.query) if self.method == 'POST' and self.query is not None else None
+        response = HttpMethods(self.session, self.page_url(position)).request(self.method, payload=payload)
+        result = response['json'] or {}
+        records = result.get('data', [])
+        page_info = result.get('pageInfo', {})
+        self.pages_fetched += 1
+
+        offset = position['offset'] + len(records)
+        if self.mode == SCROLL:
+            scroll_id = page_info.get('scrollId')
+            more = bool(records and scroll_id and page_info.get('hasMoreData'))
+        else:
+            scroll_id = None
+            more = bool(records and page_info.get('hasMoreData', len(records) >= self.page_size))
+        return records, {'scroll_id': scroll_id if more else None, 'offset': offset, 'done': not more}
+
+    def _fetch_pages(self, position):
+        while not position['done']:
+            records, position = self.fetch_page(position)
+            yield records, position
+
+    def _prefetch_pages(self, position):
+        pages = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def fetcher():
+            current = position
+            try:
+                while not current['done'] and not stop.is_set():
+                    page = self.fetch_page(current)
+                    put(page)
+                    current = page[1]
+            except Exception as e:  # pylint: disable=broad-except
+                put(e)
+            put(_DONE)
+
+        thread = threading.Thread(target=fetcher, name='vmanage-page-prefetch', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def pages(self):
+        """Iterate over the query one page at a time.
+
+        Starts from checkpoint and advances it as each page is consumed.
+
+        Returns:
+            result (generator): Lists of records.
+        """
+
+        position = dict(self.checkpoint)
+        source = self._prefetch_pages(position) if self.prefetch > 0 else self._fetch_pages(position)
+        for records, next_position in source:
+            yield records
+            # The caller has finished with the page
+            self.checkpoint = next_position
+            if self.on_checkpoint:
+                self.on_checkpoint(dict(self.checkpoint))
+
+    def records(self):
+        """Iterate over the query one record at a time.
+
+        Returns:
+            result (generator): The records.
+        """
+
+        for page in self.pages():
+            yield from page
@@ -2,10 +2,213 @@
 """
 
 import json
+import threading
+import time
+from collections import Counter
+
 from vmanage.api.http_methods import HttpMethods
 from vmanage.data.parse_methods import ParseMethods
 from vmanage.utils import list_to_dict
 
+DEFAULT_POLICY_LIST_CACHE_TTL = 60
+
+
+class PolicyListCache(object):
+    """Policy List Cache
+
+    Caches the policy list listings, all lists ('all') and the lists of
+    each type, keyed by lower case type.  Entries expire after ttl
+    seconds.  A cached 'all' listing also answers typed lookups, since
+    it holds the lists of every type.
+
+    Adding, updating or deleting a list through PolicyLists drops the
+    entry for its type and the 'all' entry.  stats counts hits, misses
+    and invalidations.
+
+    """
+    def __init__(self, ttl=DEFAULT_POLICY_LIST_CACHE_TTL):
+        """Initialize PolicyListCache object.
+
+        Args:
+            ttl (int): seconds a listing is served from the cache,
+                default 60.  None keeps listings until invalidated.
+
+        """
+
+        self.ttl = ttl
+        self.stats = Counter()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, policy_list_type):
+        entry = self._entries.get(policy_list_type)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[policy_list_type]
+            return None
+        return entry
+
+    def get(self, policy_list_type='all'):
+        """Get a cached listing.
+
+        Args:
+            policy_list_type (str): Policy list type (default: all)
+
+        Returns:
+            result (list): The policy lists, or None if not cached.
+        """
+
+        policy_list_type = policy_list_type.lower()
+        with self._lock:
+            entry = self._fresh(policy_list_type)
+            if entry is None and policy_list_type != 'all':
+                all_entry = self._fresh('all')
+                if all_entry is not None:
+                    stored, all_lists = all_entry
+                    entry = (stored, [item for item in all_lists if item['type'].lower() == policy_list_type])
+                    self._entries[policy_list_type] = entry
+            self.stats['hit' if entry is not None else 'miss'] += 1
+        if entry is None:
+            return None
+        # Callers such as list_to_dict modify the lists they are given
+        return [dict(item) for item in entry[1]]
+
+    def store(self, policy_list_type, policy_lists):
+        """Cache a listing.
+
+        Args:
+            policy_list_type (str): Policy list type, or 'all'
+            policy_lists (list): The policy lists
+
+        """
+
+        with self._lock:
+            self._entries[policy_list_type.lower()] = (time.monotonic(), [dict(item) for item in policy_lists])
+
+    def invalidate(self, policy_list_type):
+        """Drop the cached listings a change to a list of a type affects.
+
+        Args:
+            policy_list_type (str): Policy list type
+
+        """
+
+        with self._lock:
+            for key in (policy_list_type.lower(), 'all'):
+                if self._entries.pop(key, None) is not None:
+                    self.stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class PolicyListIndex(object):
+    """Policy List Index
+
+    Maps (type, name) and listId to the policy lists of the
+    template/policy/list listing, so converting a large policy between
+    names and IDs is a dictionary lookup per list reference instead of
+    a listing per reference.  Types are compared case insensitively,
+    e.g. 'dataPrefix' and 'dataprefix' are the same type.  List IDs are
+    unique across types.
+
+    """
+    def __init__(self):
+        self.loaded = False
+        self._by_name = {}
+        self._by_id = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _name_key(policy_list_type, name):
+        return (policy_list_type.lower(), name)
+
+    def load(self, policy_lists):
+        """Replace the index with the lists of a full listing.
+
+        Args:
+            policy_lists (list): All policy lists
+
+        """
+
+        with self._lock:
+            self._by_name = {}
+            self._by_id = {}
+            for policy_list in policy_lists:
+                self._add(policy_list)
+            self.loaded = True
+
+    def _add(self, policy_list):
+        old = self._by_id.get(policy_list.get('listId'))
+        if old is not None:
+            self._by_name.pop(self._name_key(old['type'], old['name']), None)
+        self._by_name[self._name_key(policy_list['type'], policy_list['name'])] = policy_list
+        if policy_list.get('listId'):
+            self._by_id[policy_list['listId']] = policy_list
+
+    def update(self, policy_list):
+        """Add or replace a list, e.g. after it was added or updated.
+
+        Args:
+            policy_list (dict): The Policy List, with its listId
+
+        """
+
+        with self._lock:
+            self._add(policy_list)
+
+    def remove(self, list_id):
+        """Drop a list, e.g. after it was deleted.
+
+        """
+        with self._lock:
+            policy_list = self._by_id.pop(list_id, None)
+            if policy_list is not None:
+                self._by_name.pop(self._name_key(policy_list['type'], policy_list['name']), None)
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded = False
+
+    def by_name(self, name, policy_list_type='all'):
+        """Find a list by name.
+
+        Args:
+            name (str): Policy list name
+            policy_list_type (str): Policy list type (default: all, the
+                first list of any type with the name)
+
+        Returns:
+            result (dict): The Policy List, or None if there is none.
+        """
+
+        with self._lock:
+            if policy_list_type != 'all':
+                return self._by_name.get(self._name_key(policy_list_type, name))
+            for policy_list in self._by_id.values():
+                if policy_list['name'] == name:
+                    return policy_list
+            return None
+
+    def by_id(self, list_id, policy_list_type='all'):
+        """Find a list by ID.
+
+        Args:
+            list_id (str): Policy list ID
+            policy_list_type (str): Policy list type (default: all)
+
+        Returns:
+            result (dict): The Policy List, or None if there is none.
+        """
+
+        with self._lock:
+            policy_list = self._by_id.get(list_id)
+        if policy_list is None or policy_list_type == 'all' or policy_list['type'].lower() == policy_list_type.lower():
+            return policy_list
+        return None
+
 
 class PolicyLists(object):
     """vManage Policy Lists API
@@ -28,7 +231,8 @@ class PolicyLists(object):
         self.host = host
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
-        self.policy_list_cache = {}
+        self.policy_list_cache = PolicyListCache()
+        self.policy_list_index = PolicyListIndex()
 
     def delete_data_prefix_list(self, listid):
         """Delete a Data Prefix List from vManage.
@@ -136,10 +340,34 @@ class PolicyLists(object):
         url = f"{self.base_url}template/policy/list/{listType.lower()}/{listId}"
         response = HttpMethods(self.session, url).request('DELETE')
         result = ParseMethods.parse_status(response)
+        self.policy_list_cache.invalidate(listType)
+        self.policy_list_index.remove(listId)
         return result
 
     def clear_policy_list_cache(self):
-        self.policy_list_cache = {}
+        self.policy_list_cache.clear()
+        self.policy_list_index.invalidate()
+
+    def get_policy_list_index(self, refresh=False):
+        """Get the index of all policy lists, loading it on first use.
+
+        Args:
+            refresh (bool): Reload the index from vManage
+
+        Returns:
+            result (obj): PolicyListIndex.
+
+        """
+        if refresh or not self.policy_list_index.loaded:
+            self.policy_list_index.load(self.get_policy_list_list(cache=not refresh))
+        return self.policy_list_index
+
+    def _find_policy_list(self, find, key, policy_list_type):
+        policy_list = find(self.get_policy_list_index(), key, policy_list_type)
+        if policy_list is None:
+            # Index miss.  The list may have been added since the index was loaded
+            policy_list = find(self.get_policy_list_index(refresh=True), key, policy_list_type)
+        return policy_list
 
     def get_policy_list_list(self, policy_list_type='all', cache=True):
         """Get a list of policy lists
@@ -152,20 +380,20 @@ class PolicyLists(object):
             result (dict): All data associated with a response.
 
         """
-        if cache and policy_list_type in self.policy_list_cache:
-            response = self.policy_list_cache[policy_list_type.lower()]
-        else:
-            if policy_list_type == 'all':
-                url = f"{self.base_url}template/policy/list"
-                # result = self.request('/template/policy/list', status_codes=[200])
-            else:
-                url = f"{self.base_url}template/policy/list/{policy_list_type.lower()}"
-                # result = self.request('/template/policy/list/{0}'.format(type.lower()), status_codes=[200, 404])
+        if cache:
+            policy_lists = self.policy_list_cache.get(policy_list_type)
+            if policy_lists is not None:
+                return policy_lists
 
-            response = HttpMethods(self.session, url).request('GET')
+        if policy_list_type == 'all':
+            url = f"{self.base_url}template/policy/list"
+        else:
+            url = f"{self.base_url}template/policy/list/{policy_list_type.lower()}"
 
-        self.policy_list_cache[policy_list_type.lower()] = response
-        return response['json']['data']
+        response = HttpMethods(self.session, url).request('GET')
+        policy_lists = response['json']['data']
+        self.policy_list_cache.store(policy_list_type, policy_lists)
+        return policy_lists
 
     def get_policy_list_dict(self, policy_list_type='all', key_name='name', remove_key=False, cache=True):
         """Get a dictionary of policy lists
@@ -195,16 +423,7 @@ class PolicyLists(object):
             result (dict): All data associated with a response.
 
         """
-        policy_list_dict = self.get_policy_list_dict(policy_list_type, cache=True)
-        if policy_list_name in policy_list_dict:
-            # Cache Hit!
-            return policy_list_dict[policy_list_name]
-        # Cache miss.  Ignore the cache
-        policy_list_dict = self.get_policy_list_dict(policy_list_type, cache=False)
-        if policy_list_name in policy_list_dict:
-            return policy_list_dict[policy_list_name]
-
-        return None
+        return self._find_policy_list(PolicyListIndex.by_name, policy_list_name, policy_list_type)
 
     def get_policy_list_by_id(self, policy_list_id, policy_list_type='all'):
         """Get a policy list by ID
@@ -217,16 +436,7 @@ class PolicyLists(object):
             result (dict): All data associated with a response.
 
         """
-        policy_list_dict = self.get_policy_list_dict(policy_list_type, key_name='listId', cache=True)
-        if policy_list_id in policy_list_dict:
-            # Cache Hit!
-            return policy_list_dict[policy_list_id]
-        # Cache miss.  Ignore the cache
-        policy_list_dict = self.get_policy_list_dict(policy_list_type, key_name='listId', cache=False)
-        if policy_list_id in policy_list_dict:
-            return policy_list_dict[policy_list_id]
-
-        return None
+        return self._find_policy_list(PolicyListIndex.by_id, policy_list_id, policy_list_type)
 
     def add_policy_list(self, policy_list):
         """Add a new Policy List to vManage.
@@ -242,7 +452,13 @@ class PolicyLists(object):
         policy_list_type = policy_list['type'].lower()
         url = f"{self.base_url}template/policy/list/{policy_list_type}"
         response = HttpMethods(self.session, url).request('POST', payload=json.dumps(policy_list))
-        return ParseMethods.parse_status(response)
+        result = ParseMethods.parse_status(response)
+        self.policy_list_cache.invalidate(policy_list_type)
+        if response['json'] and response['json'].get('listId'):
+            self.policy_list_index.update(dict(policy_list, listId=response['json']['listId']))
+        else:
+            self.policy_list_index.invalidate()
+        return result
 
     def update_policy_list(self, policy_list):
         """Update an existing Policy List on vManage.
@@ -260,4 +476,6 @@ class PolicyLists(object):
         url = f"{self.base_url}template/policy/list/{policy_list_type}/{policy_list_id}"
         response = HttpMethods(self.session, url).request('PUT', payload=json.dumps(policy_list))
         ParseMethods.parse_status(response)
+        self.policy_list_cache.invalidate(policy_list_type)
+        self.policy_list_index.update(dict(policy_list))
         return response
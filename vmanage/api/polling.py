@@ -0,0 +1,162 @@
+"""Polling Policy for Cisco vManage Long Running Operations.
+"""
+
+import random
+import time
+
+DEFAULT_INITIAL_DELAY = 1
+DEFAULT_MULTIPLIER = 2
+DEFAULT_MAX_INTERVAL = 30
+DEFAULT_JITTER = 0.1
+
+
+class PollingPolicy(object):
+    """Polling Policy for vManage Actions and Tasks
+
+    Describes how often to poll vManage while waiting for something to
+    finish: the first poll is made immediately, then the delay starts
+    at initial_delay and grows exponentially up to max_interval.  Each
+    delay is randomized by +/- jitter so that many waiters do not poll
+    in lock step.  An optional timeout bounds the total wait.
+
+    """
+    def __init__(self,
+                 initial_delay=DEFAULT_INITIAL_DELAY,
+                 multiplier=DEFAULT_MULTIPLIER,
+                 max_interval=DEFAULT_MAX_INTERVAL,
+                 jitter=DEFAULT_JITTER,
+                 timeout=None):
+        """Initialize PollingPolicy object.
+
+        Args:
+            initial_delay (float): seconds to wait after the first
+                poll, default 1
+            multiplier (float): growth factor between polls, default 2
+            max_interval (float): maximum seconds between polls,
+                default 30
+            jitter (float): fraction of each delay to randomize,
+                default 0.1
+            timeout (float): maximum total seconds to wait, default
+                None (wait forever)
+
+        """
+
+        self.initial_delay = initial_delay
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def interval(self, attempt):
+        """Seconds to wait after the given (zero based) poll attempt.
+
+        Args:
+            attempt (int): Number of polls already made minus one
+
+        Returns:
+            result (float): Delay in seconds.
+        """
+
+        delay = min(self.max_interval, self.initial_delay * (self.multiplier**attempt))
+        if self.jitter:
+            delay = delay * (1 + random.uniform(-self.jitter, self.jitter))
+        return max(0, min(delay, self.max_interval))
+
+    def deadline(self, start):
+        """Monotonic time after which waiting should stop.
+
+        Args:
+            start (float): time.monotonic() when waiting began
+
+        Returns:
+            result (float): The deadline or None for no deadline.
+        """
+
+        if self.timeout is None:
+            return None
+        return start + self.timeout
+
+    def next_delay(self, attempt, deadline):
+        """Seconds to wait before the next poll, bounded by the deadline.
+
+        Args:
+            attempt (int): Number of polls already made minus one
+            deadline (float): The value returned by deadline()
+
+        Returns:
+            result (float): Delay in seconds, or None if the deadline
+                has passed.
+        """
+
+        delay = self.interval(attempt)
+        remaining = self.remaining(deadline)
+        if remaining is not None:
+            if remaining <= 0:
+                return None
+            delay = min(delay, remaining)
+        return delay
+
+    @staticmethod
+    def remaining(deadline):
+        """Seconds left before the deadline (None if there is no deadline).
+
+        """
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
+
+    def schedule(self, description):
+        """Start a wait under this policy.
+
+        Args:
+            description (str): What is waited for, used in the timeout
+                message, e.g. 'action <id>'
+
+        Returns:
+            result (obj): PollSchedule.
+        """
+
+        return PollSchedule(self, description)
+
+
+class PollSchedule(object):
+    """The Polls of One Wait
+
+    Iterating yields the seconds to sleep before each poll: 0 before
+    the first poll, then the delays of the polling policy.  The caller
+    sleeps (time.sleep or asyncio.sleep), polls, and stops iterating
+    once the wait is over, so blocking and asyncio waiters share the
+    same schedule.  If the policy timeout expires first, iterating
+    raises an Exception naming description.
+
+    """
+    def __init__(self, policy, description):
+        self.policy = policy
+        self.description = description
+        self.start = time.monotonic()
+        self.deadline = policy.deadline(self.start)
+        self.polls = 0
+
+    def __iter__(self):
+        delay = 0
+        while True:
+            self.polls += 1
+            yield delay
+            delay = self.policy.next_delay(self.polls - 1, self.deadline)
+            if delay is None:
+                raise Exception(f"Timed out after {self.elapsed():.1f}s waiting for {self.description}")
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def stats(self):
+        """Timing stats for the wait so far.
+
+        Returns:
+            result (dict): The number of polls and the elapsed seconds.
+        """
+
+        return {'polls': self.polls, 'elapsed': self.elapsed()}
+
+
+DEFAULT_POLLING_POLICY = PollingPolicy()
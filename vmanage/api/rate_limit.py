@@ -0,0 +1,141 @@
+"""Client Side Rate Limiting for Cisco vManage API Interaction.
+"""
+
+import threading
+import time
+
+
+class TokenBucket(object):
+    """Token Bucket
+
+    Allows bursts of up to capacity requests and a sustained rate of
+    rate requests per second.  Thread safe, so one bucket can be shared
+    by every thread (and vmanage.aio task) using a transport.
+
+    """
+    def __init__(self, rate, capacity=None):
+        """Initialize TokenBucket object.
+
+        Args:
+            rate (float): tokens added per second
+            capacity (float): maximum tokens held, default rate (at
+                least 1, so that rates below one request per second
+                still allow a request)
+
+        Raises:
+            ValueError: If rate or capacity is not positive.
+
+        """
+
+        if rate <= 0:
+            raise ValueError(f'Token bucket rate must be positive, not {rate}')
+        if capacity is not None and capacity <= 0:
+            raise ValueError(f'Token bucket capacity must be positive, not {capacity}')
+        self.rate = rate
+        self.capacity = max(1, rate) if capacity is None else capacity
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Take tokens from the bucket, waiting until they are available.
+
+        Args:
+            tokens (float): Number of tokens to take, default 1
+
+        Returns:
+            result (float): Seconds spent waiting.
+
+        Raises:
+            ValueError: If more tokens are asked for than the bucket
+                can ever hold.
+        """
+
+        if tokens > self.capacity:
+            raise ValueError(f'Cannot take {tokens} tokens from a bucket with capacity {self.capacity}')
+        waited = 0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.waited += waited
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimiter(object):
+    """Rate Limiter for vManage API Interaction
+
+    Maps endpoint classes to token buckets.  An endpoint class is an API
+    path prefix relative to /dataservice/, for example 'device/' for
+    real time monitoring or 'template/' for templates and policy.  Each
+    request takes a token from the bucket of the longest matching
+    prefix, or from the default bucket when nothing matches.
+
+    """
+    def __init__(self, budgets=None, default=None):
+        """Initialize RateLimiter object.
+
+        Args:
+            budgets (dict): API path prefix -> TokenBucket, or a rate
+                (requests per second) to build one from
+            default (obj): TokenBucket or rate for all other
+                endpoints, default None (unlimited)
+
+        """
+
+        self.budgets = {}
+        for prefix, budget in (budgets or {}).items():
+            self.budgets[prefix] = budget if isinstance(budget, TokenBucket) else TokenBucket(budget)
+        if default is not None and not isinstance(default, TokenBucket):
+            default = TokenBucket(default)
+        self.default = default
+        # Longest prefix first
+        self._prefixes = sorted(self.budgets, key=len, reverse=True)
+
+    @staticmethod
+    def api_path(url):
+        """The API path of a URL, relative to /dataservice/.
+
+        """
+        path = url.split('/dataservice/', 1)[-1]
+        return path.lstrip('/')
+
+    def bucket_for(self, url):
+        """Find the token bucket governing a URL.
+
+        Args:
+            url (str): URL of the API service being called
+
+        Returns:
+            result (obj): TokenBucket, or None if unlimited.
+        """
+
+        path = self.api_path(url)
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self.budgets[prefix]
+        return self.default
+
+    def acquire(self, url):
+        """Wait until a request to url fits within its budget.
+
+        Args:
+            url (str): URL of the API service being called
+
+        Returns:
+            result (float): Seconds spent waiting.
+        """
+
+        bucket = self.bucket_for(url)
+        if bucket is None:
+            return 0
+        return bucket.acquire()
@@ -0,0 +1,191 @@
+"""Retry Policy for Cisco vManage API Interaction.
+"""
+
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+import requests
+import urllib3
+from vmanage.api.polling import PollingPolicy
+
+RETRY_STATUS_CODES = [429, 502, 503, 504]
+# Status codes where vManage rejected the request before acting on it,
+# so even a non-idempotent request can safely be sent again.
+REJECTED_STATUS_CODES = [429, 503]
+IDEMPOTENT_METHODS = ['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT']
+
+
+class RetryPolicy(object):
+    """Retry Policy for vManage API Interaction
+
+    Decides whether a failed request should be sent again and how long
+    to wait first.  Idempotent methods (GET, PUT, DELETE) are retried on
+    connection errors, timeouts and any of the retry status codes.
+    Other methods (POST) are only retried when the connection could not
+    be established (connect timeouts, refused connections and failed
+    name resolution) or vManage explicitly rejected the request (429/503),
+    so that a request is never applied twice.  A Retry-After header is
+    honoured, otherwise the delay grows exponentially with jitter.
+
+    Every retry taken is counted in retries, keyed by
+    (method, reason), for reporting.
+
+    """
+    def __init__(self,
+                 total=3,
+                 backoff_factor=1,
+                 max_backoff=30,
+                 jitter=0.1,
+                 status_codes=None,
+                 idempotent_methods=None,
+                 respect_retry_after=True,
+                 max_retry_after=120):
+        """Initialize RetryPolicy object.
+
+        Args:
+            total (int): maximum number of retries per request, default 3
+            backoff_factor (float): seconds to wait before the first
+                retry, doubled for each further retry, default 1
+            max_backoff (float): maximum seconds between retries,
+                default 30
+            jitter (float): fraction of each delay to randomize,
+                default 0.1
+            status_codes (list): status codes to retry, default
+                RETRY_STATUS_CODES
+            idempotent_methods (list): methods that are always safe to
+                retry, default IDEMPOTENT_METHODS
+            respect_retry_after (bool): wait as long as a Retry-After
+                header asks, default True
+            max_retry_after (float): upper bound on a Retry-After wait,
+                default 120
+
+        """
+
+        self.total = total
+        self.backoff = PollingPolicy(initial_delay=backoff_factor, max_interval=max_backoff, jitter=jitter)
+        self.status_codes = RETRY_STATUS_CODES if status_codes is None else status_codes
+        self.idempotent_methods = IDEMPOTENT_METHODS if idempotent_methods is None else idempotent_methods
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.retries = Counter()
+        self._lock = threading.Lock()
+
+    def is_idempotent(self, method):
+        return method.upper() in self.idempotent_methods
+
+    @staticmethod
+    def not_connected(exception):
+        """Whether a requests exception was raised before anything was
+        sent, because the connection could not be established.
+
+        Args:
+            exception (obj): The requests exception raised
+
+        Returns:
+            result (bool): True for connect timeouts, refused connections
+                and failed name resolution.
+        """
+
+        if isinstance(exception, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(exception, requests.exceptions.ConnectionError) and exception.args:
+            reason = exception.args[0]
+            if isinstance(reason, urllib3.exceptions.MaxRetryError):
+                reason = reason.reason
+            return isinstance(reason, urllib3.exceptions.NewConnectionError)
+        return False
+
+    def should_retry_exception(self, method, exception, attempt):
+        """Whether a request that raised an exception should be retried.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            exception (obj): The requests exception raised
+            attempt (int): Number of retries already taken
+
+        Returns:
+            result (bool): True to retry.
+        """
+
+        if attempt >= self.total:
+            return False
+        if self.not_connected(exception):
+            # Nothing reached vManage, safe for any method
+            return True
+        if self.is_idempotent(method):
+            return isinstance(exception, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+        return False
+
+    def should_retry_response(self, method, response, attempt):
+        """Whether a request that received a response should be retried.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            response (obj): Requests response object
+            attempt (int): Number of retries already taken
+
+        Returns:
+            result (bool): True to retry.
+        """
+
+        if attempt >= self.total or response.status_code not in self.status_codes:
+            return False
+        if self.is_idempotent(method):
+            return True
+        return response.status_code in REJECTED_STATUS_CODES
+
+    def get_delay(self, attempt, response=None):
+        """Seconds to wait before the given retry.
+
+        Args:
+            attempt (int): Number of retries already taken
+            response (obj): Requests response object, if any
+
+        Returns:
+            result (float): Delay in seconds.
+        """
+
+        if self.respect_retry_after and response is not None:
+            retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        return self.backoff.interval(attempt)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Parse a Retry-After header value into seconds.
+
+        Args:
+            value (str): delta-seconds or an HTTP-date
+
+        Returns:
+            result (float): Seconds to wait, or None if not parsable.
+        """
+
+        if not value:
+            return None
+        try:
+            return max(0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def record(self, method, reason):
+        """Count a retry that is about to be taken.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            reason (str or int): Status code or exception name
+
+        """
+        with self._lock:
+            self.retries[(method.upper(), reason)] += 1
+
+    @property
+    def total_retries(self):
+        return sum(self.retries.values())
@@ -0,0 +1,131 @@
+"""On Disk Session Cache for Cisco vManage Authentication.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_MAX_AGE = 1800
+
+
+def default_cache_dir():
+    """The default session cache directory (~/.cache/vmanage).
+
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'vmanage')
+
+
+def write_private_json(path, data):
+    """Atomically write JSON to a file readable only by its owner.
+
+    The parent directory is created with mode 0700 if needed.
+
+    Args:
+        path (str): The file to write
+        data (obj): JSON serializable data
+
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        os.chmod(tmp_path, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class SessionCache(object):
+    """On Disk Session Cache
+
+    Persists the JSESSIONID cookie, X-XSRF-TOKEN and vManage version of
+    an authenticated session, keyed by host, port and user, so that a
+    later process can reuse the session instead of logging in again.
+    Passwords are never stored.  The cache directory is created with
+    mode 0700 and each entry is written with mode 0600.
+
+    """
+    def __init__(self, cache_dir=None, max_age=DEFAULT_MAX_AGE):
+        """Initialize SessionCache object.
+
+        Args:
+            cache_dir (str): directory for cache entries, default
+                ~/.cache/vmanage
+            max_age (int): seconds after which an entry is ignored,
+                default 1800 (the vManage default session timeout)
+
+        """
+
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_age = max_age
+
+    def path(self, host, port, user):
+        """The file holding the entry for host, port and user.
+
+        """
+        key = hashlib.sha256(f'{user}@{host}:{port}'.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f'session-{key}.json')
+
+    def load(self, host, port, user):
+        """Load a cached session.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            port (int): HTTPS port of vManage
+            user (str): username the session belongs to
+
+        Returns:
+            result (dict): The cached entry, or None if there is no
+                usable entry.
+        """
+
+        try:
+            with open(self.path(host, port, user), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (not isinstance(entry, dict) or entry.get('host') != host or entry.get('port') != port
+                or entry.get('user') != user or not entry.get('cookies')):
+            return None
+        if self.max_age is not None and time.time() - entry.get('created', 0) > self.max_age:
+            return None
+        return entry
+
+    def save(self, host, port, user, cookies, xsrf_token=None, version=None):
+        """Save a session.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            port (int): HTTPS port of vManage
+            user (str): username the session belongs to
+            cookies (list): cookie dicts (name, value, domain, path)
+            xsrf_token (str): the X-XSRF-TOKEN, if any
+            version (str): the vManage version
+
+        """
+        entry = {
+            'host': host,
+            'port': port,
+            'user': user,
+            'cookies': cookies,
+            'xsrf_token': xsrf_token,
+            'version': version,
+            'created': time.time(),
+        }
+        write_private_json(self.path(host, port, user), entry)
+
+    def delete(self, host, port, user):
+        """Remove a cached session.
+
+        """
+        try:
+            os.unlink(self.path(host, port, user))
+        except FileNotFoundError:
+            pass
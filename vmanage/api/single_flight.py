@@ -0,0 +1,77 @@
+"""Coalescing of Concurrent Identical Cisco vManage API Calls.
+"""
+
+import threading
+from collections import Counter
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Single Flight Request Group
+
+    Lets concurrent callers of the same key share a single call: the
+    first caller (the leader) makes it, and callers arriving while it is
+    in flight wait for it and get its result or exception instead of
+    making their own.  A call made after the leader has finished starts
+    a new flight; nothing is kept once a flight lands.
+
+    A caller that joins a flight gets what the leader's request
+    returned, which can predate a write that completed while the flight
+    was in the air.  Only a call started after that write has finished
+    is guaranteed to see it.
+
+    HttpMethods uses the Transport's SingleFlight to coalesce identical
+    GETs, such as the policy list lookups made by parallel imports.
+
+    """
+    def __init__(self):
+        self.stats = Counter()
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Call func, or wait for the call already in flight for key.
+
+        Args:
+            key (obj): Hashable identity of the call
+            func (callable): Makes the call
+
+        Returns:
+            result (tuple): The result of the call, and True if it was
+                shared from another caller's call.
+
+        Raises:
+            Exception: Whatever the call raised.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['calls'] += 1
+            else:
+                self.stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
@@ -0,0 +1,205 @@
+"""Cisco vManage HTTP Transport.
+"""
+
+import ssl
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from vmanage.api.compression import ACCEPT_ENCODING, DEFAULT_COMPRESS_MIN_SIZE
+
+DEFAULT_POOL_CONNECTIONS = 10
+# Above the 10 workers of the concurrent helpers, so that connections
+# are not discarded when they all finish at once
+DEFAULT_POOL_MAXSIZE = 20
+
+
+def check_ssl_context(ssl_context, verify):
+    """Check that an SSL context agrees with certificate validation.
+
+    urllib3 sets the verify_mode of the context it is given to match
+    the verify setting of each request, which changes a context the
+    caller may share and fails outright for a context with
+    check_hostname set and verification off.
+
+    Args:
+        ssl_context (obj): ssl.SSLContext, or None
+        verify (bool): Whether certificates are validated
+
+    Raises:
+        Exception: If the context validates certificates and verify is
+            off, or the other way round.
+    """
+
+    if ssl_context is None:
+        return
+    if verify and ssl_context.verify_mode != ssl.CERT_REQUIRED:
+        raise Exception('ssl_context must have verify_mode CERT_REQUIRED when certificates are validated '
+                        '(validate_certs on, or a CA bundle set with REQUESTS_CA_BUNDLE)')
+    if not verify and (ssl_context.verify_mode != ssl.CERT_NONE or ssl_context.check_hostname):
+        raise Exception('ssl_context validates certificates but validate_certs is off; turn validate_certs on, '
+                        'or set check_hostname False and verify_mode CERT_NONE on the context')
+
+
+class TransportAdapter(HTTPAdapter):
+    """HTTP Adapter for vManage API Interaction
+
+    A Requests HTTPAdapter that optionally shares a single SSL context
+    (CA certificates, ciphers, protocol versions) across every pooled
+    connection, so certificate stores are loaded once instead of for
+    each new connection.  The context must agree with the verify
+    setting of the session, see check_ssl_context.
+
+    """
+    def __init__(self, ssl_context=None, **kwargs):
+        """Initialize TransportAdapter object.
+
+        Args:
+            ssl_context (obj): ssl.SSLContext shared by all pooled
+                connections, default None (urllib3 default context)
+            kwargs: Passed through to requests.adapters.HTTPAdapter
+
+        """
+
+        self.ssl_context = ssl_context
+        super(TransportAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.ssl_context is not None:
+            pool_kwargs['ssl_context'] = self.ssl_context
+        super(TransportAdapter, self).init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self.ssl_context is not None:
+            proxy_kwargs['ssl_context'] = self.ssl_context
+        return super(TransportAdapter, self).proxy_manager_for(proxy, **proxy_kwargs)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        check_ssl_context(self.ssl_context, kwargs.get('verify', True))
+        return super(TransportAdapter, self).send(request, **kwargs)
+
+
+class Transport(requests.Session):
+    """Pooled HTTP Transport for vManage API Interaction
+
+    A Requests Session with an explicitly sized, keep-alive connection
+    pool.  A single Transport is returned by Authentication.login() and
+    is accepted anywhere the API classes expect a session, so every
+    call made through HttpMethods reuses the same pooled connections
+    instead of paying for a new TCP/TLS handshake.
+
+    When the session expires, HttpMethods asks the transport to
+    re-authenticate through its authenticator (the Authentication object
+    that created it).  Only one thread logs in again; concurrent callers
+    wait for it and then replay their requests with the new session.
+
+    """
+    def __init__(self,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False,
+                 ssl_context=None,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 request_hooks=None,
+                 json_decoder=None,
+                 compress_requests=False,
+                 compress_min_size=DEFAULT_COMPRESS_MIN_SIZE,
+                 http_cache=None,
+                 single_flight=None,
+                 circuit_breaker=None):
+        """Initialize Transport object with connection pool parameters.
+
+        Args:
+            pool_connections (int): number of per-host connection
+                pools to keep, default 10
+            pool_maxsize (int): maximum number of connections kept
+                open to a single host, default 20
+            pool_block (bool): when True, never open more than
+                pool_maxsize connections to a host and wait for a
+                free connection instead
+            ssl_context (obj): ssl.SSLContext shared by all pooled
+                connections, default None.  Its verify_mode must match
+                the verify setting of the session.
+            retry_policy (obj): RetryPolicy applied by HttpMethods to
+                every request, default None (no retries)
+            rate_limiter (obj): RateLimiter shared by every request,
+                default None (unlimited)
+            request_hooks (list): RequestHook objects (such as a
+                MetricsCollector) told about every request
+            json_decoder (obj): JsonDecoder for response bodies,
+                default the fastest installed (see json_decoder)
+            compress_requests (bool): gzip POST/PUT bodies of at least
+                compress_min_size bytes.  Turned off again if vManage
+                answers 415 Unsupported Media Type.  Default False
+            compress_min_size (int): smallest body compressed, default
+                4096 bytes
+            http_cache (obj): HttpCache for configuration GETs, default
+                None (no caching)
+            single_flight (obj): SingleFlight sharing concurrent
+                identical GETs, default None (not shared)
+            circuit_breaker (obj): CircuitBreaker failing calls to an
+                unhealthy host fast, default None
+
+        """
+
+        super(Transport, self).__init__()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.ssl_context = ssl_context
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.request_hooks = list(request_hooks or [])
+        self.json_decoder = json_decoder
+        self.compress_requests = compress_requests
+        self.compress_min_size = compress_min_size
+        self.http_cache = http_cache
+        self.single_flight = single_flight
+        self.circuit_breaker = circuit_breaker
+        self.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self.authenticator = None
+        self.capabilities = None
+        self.auth_generation = 0
+        self.reauthentications = 0
+        self._reauth_lock = threading.RLock()
+        self._reauthenticating = False
+
+        adapter = TransportAdapter(ssl_context=ssl_context,
+                                   pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def reauthenticate(self, generation):
+        """Re-authenticate after the session has expired.
+
+        Args:
+            generation (int): The auth_generation the expired request
+                was sent with.  If another thread has re-authenticated
+                since then, the new session is used as is.
+
+        Returns:
+            result (bool): True if the request should be replayed.
+        """
+
+        if self.authenticator is None:
+            return False
+        with self._reauth_lock:
+            if self._reauthenticating:
+                # A request made by the login flow itself
+                return False
+            if generation != self.auth_generation:
+                return True
+            self._reauthenticating = True
+            try:
+                self.cookies.clear()
+                self.headers.pop('X-XSRF-TOKEN', None)
+                # An expired session may mean vManage was upgraded
+                self.authenticator.authenticate(refresh_capabilities=True)
+                self.auth_generation += 1
+                self.reauthentications += 1
+            finally:
+                self._reauthenticating = False
+        return True
@@ -2,8 +2,12 @@
 """
 
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from vmanage.api.capabilities import DEFAULT_CAPABILITIES_CACHE
 from vmanage.api.http_methods import HttpMethods
+from vmanage.api.polling import DEFAULT_POLLING_POLICY
 from vmanage.data.parse_methods import ParseMethods
+from vmanage.utils import DEFAULT_MAX_WORKERS
 
 
 class Utilities(object):
@@ -14,13 +18,15 @@ class Utilities(object):
     for an action to complete before moving onto the next task.
 
     """
-    def __init__(self, session, host, port=443):
+    def __init__(self, session, host, port=443, polling_policy=None):
         """Initialize Utilities object with session parameters.
 
         Args:
             session (obj): Requests Session object
             host (str): hostname or IP address of vManage
             port (int): default HTTPS 443
+            polling_policy (obj): PollingPolicy used when waiting on
+                actions, default DEFAULT_POLLING_POLICY
 
         """
 
@@ -28,6 +34,8 @@ class Utilities(object):
         self.host = host
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
+        self.polling_policy = polling_policy or DEFAULT_POLLING_POLICY
+        self.action_stats = {}
 
     def get_active_count(self):
         """Provides number of active tasks on vManage.
@@ -50,33 +58,57 @@ class Utilities(object):
         version = result[0]['version']
         return version
 
-    def waitfor_action_completion(self, action_id):
-        status = 'in_progress'
-        response = {}
+    def get_capabilities(self):
+        """Provides the version and feature flags of vManage.
+
+        Uses the capabilities recorded on the session at login, or the
+        capabilities cache, so the version is normally not fetched again.
+
+        Returns:
+            result (obj): Capabilities of vManage.
+        """
+
+        capabilities = getattr(self.session, 'capabilities', None)
+        if capabilities is None:
+            capabilities = DEFAULT_CAPABILITIES_CACHE.get(self.host, self.port)
+        if capabilities is None:
+            capabilities = DEFAULT_CAPABILITIES_CACHE.set(self.host, self.port, self.get_vmanage_version())
+        return capabilities
+
+    def get_action_status(self, action_id):
+        """Retrieve the current status of an action.
+
+        Args:
+            action_id (str): The ID of the action
+
+        Returns:
+            result (dict): The action status, activity and config along
+                with the full response from vManage.
+        """
+
+        url = f"{self.base_url}device/action/status/{action_id}"
+        response = HttpMethods(self.session, url).request('GET')
+        ParseMethods.parse_data(response)
+
         action_status = None
         action_activity = None
         action_config = None
-        while status == "in_progress":
-            url = f"{self.base_url}device/action/status/{action_id}"
-            response = HttpMethods(self.session, url).request('GET')
-            ParseMethods.parse_data(response)
-
-            if 'json' in response:
-                status = response['json']['summary']['status']
-                if 'data' in response['json'] and response['json']['data']:
-                    action_status = response['json']['data'][0]['statusId']
-                    action_activity = response['json']['data'][0]['activity']
-                    if 'actionConfig' in response['json']['data'][0]:
-                        action_config = response['json']['data'][0]['actionConfig']
-                    else:
-                        action_config = None
+        if 'json' in response:
+            status = response['json']['summary']['status']
+            if 'data' in response['json'] and response['json']['data']:
+                action_status = response['json']['data'][0]['statusId']
+                action_activity = response['json']['data'][0]['activity']
+                if 'actionConfig' in response['json']['data'][0]:
+                    action_config = response['json']['data'][0]['actionConfig']
                 else:
-                    action_status = status
+                    action_config = None
             else:
-                raise Exception(msg="Unable to get action status: No response")
-            time.sleep(10)
+                action_status = status
+        else:
+            raise Exception("Unable to get action status: No response")
 
         return {
+            'status': status,
             'action_response': response['json'],
             'action_id': action_id,
             'action_status': action_status,
@@ -84,6 +116,138 @@ class Utilities(object):
             'action_config': action_config
         }
 
+    def waitfor_action_completion(self, action_id, polling_policy=None):
+        """Wait for an action to complete.
+
+        Polls the action status according to the polling policy until
+        vManage reports that it is no longer in progress.
+
+        Args:
+            action_id (str): The ID of the action
+            polling_policy (obj): PollingPolicy overriding the default
+                for this call
+
+        Returns:
+            result (dict): The final action status along with timing
+                stats ('action_stats') for the wait.
+
+        Raises:
+            Exception: The polling policy timeout expired.
+        """
+
+        schedule = (polling_policy or self.polling_policy).schedule(f'action {action_id}')
+        for delay in schedule:
+            time.sleep(delay)
+            result = self.get_action_status(action_id)
+            if result.pop('status') != 'in_progress':
+                break
+
+        result['action_stats'] = schedule.stats()
+        self.action_stats[action_id] = result['action_stats']
+        return result
+
+    def wait_for_actions(self, action_ids, polling_policy=None, max_workers=DEFAULT_MAX_WORKERS):
+        """Wait for several actions to complete at once.
+
+        All outstanding actions are polled from a single scheduler loop,
+        each on its own backoff schedule, with the polls that are due
+        issued concurrently.  Each poll is handled as soon as it returns,
+        so an action is yielded as soon as it finishes, in order of
+        completion, without waiting for slower polls of other actions.
+        The polling policy timeout is a single deadline shared by all of
+        the actions.
+
+        Args:
+            action_ids (list): The IDs of the actions
+            polling_policy (obj): PollingPolicy overriding the default
+                for this call
+            max_workers (int): Maximum number of concurrent polls
+
+        Returns:
+            result (generator): The final status of each action, as
+                returned by waitfor_action_completion.
+
+        Raises:
+            Exception: The polling policy timeout expired.
+        """
+
+        policy = polling_policy or self.polling_policy
+        start = time.monotonic()
+        deadline = policy.deadline(start)
+        # action_id -> [polls made, monotonic time of next poll or None while polling]
+        pending = {action_id: [0, start] for action_id in dict.fromkeys(action_ids)}
+        # future -> action_id of the polls in flight
+        polling = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                now = time.monotonic()
+                for action_id, state in pending.items():
+                    if state[1] is not None and state[1] <= now:
+                        state[1] = None
+                        polling[executor.submit(self.get_action_status, action_id)] = action_id
+
+                scheduled = [next_poll for _, next_poll in pending.values() if next_poll is not None]
+                timeout = max(0, min(scheduled) - now) if scheduled else None
+                remaining = policy.remaining(deadline)
+                if remaining is not None:
+                    if remaining <= 0:
+                        raise Exception(f"Timed out after {time.monotonic() - start:.1f}s waiting for actions "
+                                        f"{', '.join(pending)}")
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                if not polling:
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(polling, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    action_id = polling.pop(future)
+                    result = future.result()
+                    pending[action_id][0] += 1
+                    polls = pending[action_id][0]
+                    if result.pop('status') != 'in_progress':
+                        del pending[action_id]
+                        result['action_stats'] = {'polls': polls, 'elapsed': time.monotonic() - start}
+                        self.action_stats[action_id] = result['action_stats']
+                        yield result
+                    else:
+                        pending[action_id][1] = time.monotonic() + policy.interval(polls - 1)
+
+    def wait_for_tasks(self, task_ids=None, polling_policy=None):
+        """Wait for vManage tasks to finish.
+
+        With no task IDs, waits until vManage reports no active tasks
+        at all.  With task IDs, waits only for those tasks (the action
+        IDs returned when they were started) and ignores unrelated
+        activity.
+
+        Args:
+            task_ids (list): The IDs of the tasks to wait for, default
+                None (wait for all tasks)
+            polling_policy (obj): PollingPolicy overriding the default
+                for this call
+
+        Returns:
+            result (dict or list): Timing stats for the wait, or the
+                final status of each task when task_ids is given.
+
+        Raises:
+            Exception: The polling policy timeout expired.
+        """
+
+        if task_ids:
+            return list(self.wait_for_actions(task_ids, polling_policy=polling_policy))
+
+        schedule = (polling_policy or self.polling_policy).schedule('active tasks')
+        for delay in schedule:
+            time.sleep(delay)
+            data = self.get_active_count()
+            if data['activeTaskCount'] == 0:
+                break
+            schedule.description = f"{data['activeTaskCount']} active tasks"
+
+        return schedule.stats()
+
     def upload_file(self, input_file):
         """Upload a file to vManage.
 
@@ -1,7 +1,6 @@
 """Clean vManage Resources.
 """
 
-import time
 from vmanage.api.utilities import Utilities
 from vmanage.api.central_policy import CentralPolicy
 from vmanage.api.device import Device
@@ -44,28 +43,29 @@ class CleanVmanage(object):
         self.policy_definitions = PolicyDefinitions(self.session, self.host)
         self.policy_lists = PolicyLists(self.session, self.host)
 
-    def active_count_delay(self):
+    def active_count_delay(self, task_ids=None):
         """Delay while there are active tasks.
 
+        Args:
+            task_ids (list): Only wait for these tasks, default None
+                (wait until there are no active tasks)
+
         """
-        activeCount = 1
-        while activeCount != 0:
-            time.sleep(1.0)
-            data = self.utilities.get_active_count()
-            activeCount = data["activeTaskCount"]
+        self.utilities.wait_for_tasks(task_ids)
 
     def clean_vedge_attachments(self):
         """Clean all vedge attachments
 
         """
         data = self.device.get_device_list('vedges')
+        action_id_list = []
         for device in data:
             if (('deviceIP' in device) and (device['configOperationMode'] == 'vmanage')):
                 deviceId = device['uuid']
                 deviceIP = device['deviceIP']
                 deviceType = device['deviceType']
-                self.device.post_device_cli_mode(deviceId, deviceIP, deviceType)
-        self.active_count_delay()
+                action_id_list.append(self.device_templates.detach_from_template(deviceId, deviceIP, deviceType))
+        self.active_count_delay(action_id_list)
 
     def clean_controller_attachments(self):
         """Clean all controller attachments
@@ -77,9 +77,9 @@ class CleanVmanage(object):
                 deviceId = device['uuid']
                 deviceIP = device['deviceIP']
                 deviceType = device['deviceType']
-                self.device.post_device_cli_mode(deviceId, deviceIP, deviceType)
+                action_id = self.device_templates.detach_from_template(deviceId, deviceIP, deviceType)
                 # Requires pause between controllers
-                self.active_count_delay()
+                self.active_count_delay([action_id])
         self.active_count_delay()
 
     def clean_device_templates(self):
@@ -154,8 +154,7 @@ class CleanVmanage(object):
         """Clean all security policy
 
         """
-        version = self.utilities.get_vmanage_version()
-        if version >= '18.2.0':
+        if self.utilities.get_capabilities().supports('security_policy'):
             data = self.sec_pol.get_security_policy()
             for policy in data:
                 policyId = policy['policyId']
@@ -41,9 +41,10 @@ def connections(ctx, device, json):
             "-------------------------------------------------------------------------------------------------------------------"
         )
 
-    for dev in device_list:
+    for dev, control_connections, error in mn.map('get_control_connections', device_list):
+        if error:
+            continue
         try:
-            control_connections = mn.get_control_connections(dev)
             if json:
                 pp = pprint.PrettyPrinter(indent=2)
                 pp.pprint(control_connections)
@@ -82,7 +82,9 @@ def templates(ctx, template_type, diff, default, name, json):
             else:
                 pp.pprint(device_template_list)
         if template_type in ['feature', None]:
-            feature_template_list = feature_templates.get_feature_template_list(factory_default=default)
+            # The table only shows index fields
+            feature_template_list = feature_templates.get_feature_template_list(factory_default=default,
+                                                                                index_only=not json)
             if not json:
                 click.echo("                                                    DEVICE     DEVICES   DEVICE")
                 click.echo("NAME                           TYPE                 TEMPLATES  ATTACHED  MODELS")
@@ -0,0 +1,85 @@
+"""Cisco vManage Template and Policy ID/Name Resolution.
+"""
+
+from vmanage.api.feature_templates import FeatureTemplates
+from vmanage.api.local_policy import LocalPolicy
+
+
+class NameResolver(object):
+    """ID <-> Name Resolver for Feature Templates and Local Policies
+
+    Holds templateId <-> templateName and policyId <-> policyName maps,
+    each fetched once (from the index only feature template listing and
+    the template/policy/vedge listing) and then shared by every
+    conversion in an export or import run.  A lookup that misses
+    refetches the listing once, so templates and policies added during
+    the run are still found.
+
+    """
+    def __init__(self, session, host, port=443):
+        """Initialize NameResolver object with session parameters.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+
+        """
+
+        self.session = session
+        self.host = host
+        self.port = port
+        self.feature_templates = FeatureTemplates(self.session, self.host, self.port)
+        self.local_policy = LocalPolicy(self.session, self.host, self.port)
+        self._maps = {}
+
+    def _load(self, kind):
+        if kind == 'feature_template':
+            items = self.feature_templates.get_feature_template_list(factory_default=True, index_only=True)
+            id_key, name_key = 'templateId', 'templateName'
+        else:
+            items = self.local_policy.get_local_policy()
+            id_key, name_key = 'policyId', 'policyName'
+        id_to_name = {item[id_key]: item[name_key] for item in items}
+        name_to_id = {item[name_key]: item[id_key] for item in items}
+        self._maps[kind] = (id_to_name, name_to_id)
+
+    def _lookup(self, kind, direction, key):
+        if kind not in self._maps:
+            self._load(kind)
+        elif key not in self._maps[kind][direction]:
+            # Added since the listing was fetched
+            self._load(kind)
+        return self._maps[kind][direction].get(key)
+
+    def feature_template_name(self, template_id):
+        """The name of a feature template.
+
+        Returns:
+            result (str): The templateName, or None if there is none.
+        """
+        return self._lookup('feature_template', 0, template_id)
+
+    def feature_template_id(self, template_name):
+        """The ID of a feature template.
+
+        Returns:
+            result (str): The templateId, or None if there is none.
+        """
+        return self._lookup('feature_template', 1, template_name)
+
+    def local_policy_name(self, policy_id):
+        """The name of a local policy.
+
+        Returns:
+            result (str): The policyName, or None if there is none.
+        """
+        return self._lookup('local_policy', 0, policy_id)
+
+    def local_policy_id(self, policy_name):
+        """The ID of a local policy.
+
+        Returns:
+            result (str): The policyId, or None if there is none.
+        """
+        return self._lookup('local_policy', 1, policy_name)
@@ -224,9 +224,10 @@ class PolicyData(object):
             if 'match' in sequence and 'entries' in sequence['match']:
                 for entry in sequence['match']['entries']:
                     if 'listName' in entry:
-                        policy_list_dict = self.policy_lists.get_policy_list_dict(entry['listType'])
-                        if entry['listName'] in policy_list_dict:
-                            entry['ref'] = policy_list_dict[entry['listName']]['listId']
+                        policy_list = self.policy_lists.get_policy_list_by_name(entry['listName'],
+                                                                                policy_list_type=entry['listType'])
+                        if policy_list:
+                            entry['ref'] = policy_list['listId']
                             entry.pop('listName')
                             entry.pop('listType')
                         else:
@@ -6,7 +6,7 @@ from vmanage.api.feature_templates import FeatureTemplates
 from vmanage.api.device_templates import DeviceTemplates
 from vmanage.api.utilities import Utilities
 from vmanage.api.device import Device
-from vmanage.api.local_policy import LocalPolicy
+from vmanage.data.name_resolver import NameResolver
 
 
 class TemplateData(object):
@@ -31,25 +31,41 @@ class TemplateData(object):
         self.device_templates = DeviceTemplates(self.session, self.host, self.port)
         self.feature_templates = FeatureTemplates(self.session, self.host, self.port)
 
-    def convert_device_template_to_name(self, device_template):
+    def new_resolver(self):
+        """Create an ID/Name resolver for one export or import run.
+
+        Returns:
+            result (obj): NameResolver.
+        """
+
+        return NameResolver(self.session, self.host, self.port)
+
+    def convert_device_template_to_name(self, device_template, resolver=None):
         """Convert a device template objects from IDs to Names.
 
         Args:
             device_template (dict): Device Template
+            resolver (obj): NameResolver shared by the run, default None
+                (a new one)
 
         Returns:
             result (dict): Converted Device Template.
         """
 
-        feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True,
-                                                                                 key_name='templateId')
+        if resolver is None:
+            resolver = self.new_resolver()
+
+        def feature_template_name(template_id):
+            template_name = resolver.feature_template_name(template_id)
+            if template_name is None:
+                raise Exception(f"Could not find feature template {template_id}")
+            return template_name
 
         if 'policyId' in device_template and device_template['policyId']:
             policy_id = device_template['policyId']
-            vmanage_local_policy = LocalPolicy(self.session, self.host, self.port)
-            local_policy_dict = vmanage_local_policy.get_local_policy_dict(key_name='policyId')
-            if policy_id in list(local_policy_dict.keys()):
-                device_template['policyName'] = local_policy_dict[policy_id]['policyName']
+            policy_name = resolver.local_policy_name(policy_id)
+            if policy_name is not None:
+                device_template['policyName'] = policy_name
             else:
                 raise Exception(f"Could not find local policy {policy_id}")
 
@@ -57,17 +73,15 @@ class TemplateData(object):
             generalTemplates = []
             for old_template in device_template.pop('generalTemplates'):
                 new_template = {
-                    'templateName': feature_template_dict[old_template['templateId']]['templateName'],
+                    'templateName': feature_template_name(old_template['templateId']),
                     'templateType': old_template['templateType']
                 }
                 if 'subTemplates' in old_template:
                     subTemplates = []
                     for sub_template in old_template['subTemplates']:
                         subTemplates.append({
-                            'templateName':
-                            feature_template_dict[sub_template['templateId']]['templateName'],
-                            'templateType':
-                            sub_template['templateType']
+                            'templateName': feature_template_name(sub_template['templateId']),
+                            'templateType': sub_template['templateType']
                         })
                     new_template['subTemplates'] = subTemplates
                 generalTemplates.append(new_template)
@@ -75,69 +89,71 @@ class TemplateData(object):
 
         return device_template
 
-    def convert_device_template_to_id(self, device_template):
+    def convert_device_template_to_id(self, device_template, resolver=None):
         """Convert a device template objects from Names to IDs.
 
         Args:
             device_template (dict): Device Template
+            resolver (obj): NameResolver shared by the run, default None
+                (a new one)
 
         Returns:
             result (dict): Converted Device Template.
         """
 
+        if resolver is None:
+            resolver = self.new_resolver()
+
         if 'policyName' in device_template:
-            vmanage_local_policy = LocalPolicy(self.session, self.host, self.port)
-            local_policy_dict = vmanage_local_policy.get_local_policy_dict(key_name='policyName')
-            if device_template['policyName'] in local_policy_dict:
-                device_template['policyId'] = local_policy_dict[device_template['policyName']]['policyId']
+            policy_id = resolver.local_policy_id(device_template['policyName'])
+            if policy_id is not None:
+                device_template['policyId'] = policy_id
                 device_template.pop('policyName')
             else:
                 raise Exception(f"Could not find local policy {device_template['policyName']}")
 
         if 'generalTemplates' in device_template:
-            device_template['generalTemplates'] = self.generalTemplates_to_id(device_template['generalTemplates'])
+            device_template['generalTemplates'] = self.generalTemplates_to_id(device_template['generalTemplates'],
+                                                                              resolver=resolver)
 
         return device_template
 
-    def generalTemplates_to_id(self, generalTemplates):
+    def generalTemplates_to_id(self, generalTemplates, resolver=None):
         """Convert a generalTemplates object from Names to IDs.
 
         Args:
             generalTemplates (dict): generalTemplates object
+            resolver (obj): NameResolver shared by the run, default None
+                (a new one)
 
         Returns:
             result (dict): Converted generalTemplates object.
         """
 
+        if resolver is None:
+            resolver = self.new_resolver()
+
+        def feature_template_id(template):
+            if 'templateName' not in template:
+                raise Exception(f"Bad template {template}")
+            template_id = resolver.feature_template_id(template['templateName'])
+            if template_id is None:
+                raise Exception(f"There is no existing feature template named {template['templateName']}")
+            return template_id
+
         converted_generalTemplates = []
-        feature_templates = self.feature_templates.get_feature_template_dict(factory_default=True)
         for template in generalTemplates:
-            if 'templateName' not in template:
-                self.result['generalTemplates'] = generalTemplates
-                self.fail_json(msg="Bad template")
-            if template['templateName'] in feature_templates:
-                template_item = {
-                    'templateId': feature_templates[template['templateName']]['templateId'],
-                    'templateType': template['templateType']
-                }
-                if 'subTemplates' in template:
-                    subTemplates = []
-                    for sub_template in template['subTemplates']:
-                        if sub_template['templateName'] in feature_templates:
-                            subTemplates.append({
-                                'templateId':
-                                feature_templates[sub_template['templateName']]['templateId'],
-                                'templateType':
-                                sub_template['templateType']
-                            })
-                        else:
-                            self.fail_json(msg="There is no existing feature template named {0}".format(
-                                sub_template['templateName']))
-                    template_item['subTemplates'] = subTemplates
-
-                converted_generalTemplates.append(template_item)
-            else:
-                self.fail_json(msg="There is no existing feature template named {0}".format(template['templateName']))
+            template_item = {'templateId': feature_template_id(template), 'templateType': template['templateType']}
+            if 'subTemplates' in template:
+                subTemplates = []
+                for sub_template in template['subTemplates']:
+                    subTemplates.append({
+                        'templateId': feature_template_id(sub_template),
+                        'templateType': sub_template['templateType']
+                    })
+                template_item['subTemplates'] = subTemplates
+
+            converted_generalTemplates.append(template_item)
 
         return converted_generalTemplates
 
@@ -156,15 +172,18 @@ class TemplateData(object):
         """
         # Process the feature templates
         feature_template_updates = []
-        feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True, remove_key=False)
+        # Only the definitions of templates being imported are decoded
+        feature_template_records = {
+            record.template_name: record
+            for record in self.feature_templates.get_feature_template_records(factory_default=True)
+        }
         for feature_template in feature_template_list:
             if 'templateId' in feature_template:
                 feature_template.pop('templateId')
-            if feature_template['templateName'] in feature_template_dict:
-                existing_template = feature_template_dict[feature_template['templateName']]
-                feature_template['templateId'] = existing_template['templateId']
-                diff = list(
-                    dictdiffer.diff(existing_template['templateDefinition'], feature_template['templateDefinition']))
+            if feature_template['templateName'] in feature_template_records:
+                existing_template = feature_template_records[feature_template['templateName']]
+                feature_template['templateId'] = existing_template.template_id
+                diff = list(dictdiffer.diff(existing_template.definition, feature_template['templateDefinition']))
                 if len(diff):
                     feature_template_updates.append({'name': feature_template['templateName'], 'diff': diff})
                     if not check_mode and update:
@@ -187,27 +206,13 @@ class TemplateData(object):
         Returns:
             result (dict): All data associated with a response.
         """
-        if name_list is None:
-            name_list = []
-        device_template_list = self.device_templates.get_device_templates()
+        device_template_list = self.device_templates.get_device_template_list(factory_default=factory_default,
+                                                                              name_list=name_list)
+        resolver = self.new_resolver()
         return_list = []
-
-        #pylint: disable=too-many-nested-blocks
         for device_template in device_template_list:
-            # If there is a list of template name, only return the ones asked for.
-            # Otherwise, return them all
-            if name_list and device_template['templateName'] not in name_list:
-                continue
-            obj = self.device_templates.get_device_template_object(device_template['templateId'])
-            if obj:
-                if not factory_default and obj['factoryDefault']:
-                    continue
-                obj['templateId'] = device_template['templateId']
-
-                # obj['attached_devices'] = self.get_template_attachments(device['templateId'])
-                # obj['input'] = self.get_template_input(device['templateId'])
-                converted_device_template = self.convert_device_template_to_name(obj)
-                return_list.append(converted_device_template)
+            converted_device_template = self.convert_device_template_to_name(device_template, resolver=resolver)
+            return_list.append(converted_device_template)
         return return_list
 
     def import_device_template_list(self, device_template_list, check_mode=False, update=False):
@@ -225,13 +230,14 @@ class TemplateData(object):
         """
         device_template_updates = []
         device_template_dict = self.device_templates.get_device_template_dict()
+        resolver = self.new_resolver()
         diff = []
         for device_template in device_template_list:
             if 'policyId' in device_template:
                 device_template.pop('policyId')
             if device_template['templateName'] in device_template_dict:
                 existing_template = self.convert_device_template_to_name(
-                    device_template_dict[device_template['templateName']])
+                    device_template_dict[device_template['templateName']], resolver=resolver)
                 device_template['templateId'] = existing_template['templateId']
                 # Just check the things that we care about changing.
                 diff_ignore = set([
@@ -243,7 +249,8 @@ class TemplateData(object):
                     device_template_updates.append({'name': device_template['templateName'], 'diff': diff})
                     if not check_mode and update:
                         if not check_mode:
-                            converted_device_template = self.convert_device_template_to_id(device_template)
+                            converted_device_template = self.convert_device_template_to_id(device_template,
+                                                                                           resolver=resolver)
                             self.device_templates.update_device_template(converted_device_template)
             else:
                 if 'generalTemplates' in device_template:
@@ -254,7 +261,7 @@ class TemplateData(object):
                     raise Exception("Template {0} is of unknown type".format(device_template['templateName']))
                 device_template_updates.append({'name': device_template['templateName'], 'diff': diff})
                 if not check_mode:
-                    converted_device_template = self.convert_device_template_to_id(device_template)
+                    converted_device_template = self.convert_device_template_to_id(device_template, resolver=resolver)
                     self.device_templates.add_device_template(converted_device_template)
 
         return device_template_updates
@@ -328,8 +335,7 @@ class TemplateData(object):
 
         utilities = Utilities(self.session, self.host)
         # Batch the waits so that the peocessing of the attachments is in parallel
-        for action_id in action_id_list:
-            result = utilities.waitfor_action_completion(action_id)
+        for result in utilities.wait_for_actions(action_id_list):
             data = result['action_response']['data'][0]
             if result['action_status'] == 'failure':
                 attachment_failures.update({data['uuid']: data['currentActivity']})
@@ -1,3 +1,11 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_MAX_WORKERS = 10
+
+DeviceResult = namedtuple('DeviceResult', ['system_ip', 'result', 'error'])
+
+
 def list_to_dict(lst, key_name, remove_key=True):
     """Convert a list of dictionaries into a dictionary of dictionaries.
 
@@ -21,3 +29,36 @@ def list_to_dict(lst, key_name, remove_key=True):
             d[key] = item
 
     return d
+
+
+def map_devices(func, system_ips, *args, max_workers=DEFAULT_MAX_WORKERS):
+    """Run a per-device API call for many devices on a thread pool.
+
+    Results are yielded as each device completes, not in input order.
+    An exception raised for one device is returned in that device's
+    result instead of aborting the remaining devices.
+
+    Args:
+        func (callable): The per-device method, called as func(*args, system_ip)
+        system_ips (list): The system IPs of the devices
+        args: Leading positional arguments for func
+        max_workers (int): Maximum number of concurrent calls
+
+    Returns:
+        result (generator): DeviceResult(system_ip, result, error) tuples.
+
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(func, *args, system_ip): system_ip for system_ip in system_ips}
+    try:
+        for future in as_completed(futures):
+            system_ip = futures[future]
+            try:
+                yield DeviceResult(system_ip, future.result(), None)
+            except Exception as e:
+                yield DeviceResult(system_ip, None, e)
+    finally:
+        # Stop pending calls if the caller stops iterating early
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)